@@ -5,7 +5,7 @@ cd "C:\Users\Isaac\OneDrive - Van Paper Company\Python_Projects\Sales_Leaderboar
 "C:\Users\Isaac\AppData\Local\Programs\Python\Python313\python.exe" one_click_update.py
 echo.
 echo Pushing sync timestamp to live app...
-git add last_sync.txt
+git add last_sync.txt sync_metadata.json
 git commit -m "Update sync timestamp from manual run"
 git push
 echo.
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Canonical Text Export
+Converts a Van Paper xlsx export into a canonical, sorted CSV that git can diff
+and delta-compress. Ingest writes leaderboard_new.csv next to the workbook and
+commits the CSV instead of the binary xlsx; the app can load either.
+
+Usage:
+    python canonical_export.py convert leaderboardexport.xlsx [out.csv]
+    python canonical_export.py rewrite-history      # canonical CSVs for every past export
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+APP_DIR = Path(__file__).parent
+CANONICAL_FILE = APP_DIR / "leaderboard_new.csv"
+HISTORY_DIR = APP_DIR / "history" / "canonical"
+
+# Column order of the Van Paper export
+EXPORT_COLUMNS = ["Customer Name", "Salesperson", "Prospect", "Last Invoice Date", "Customer Number"]
+
+# Rows are ordered by these so a new report mostly shows up as appended lines
+SORT_COLUMNS = ["Customer Number", "Salesperson", "Customer Name"]
+
+# Workbooks that have held live data over the project's history
+HISTORY_PATHS = ["leaderboard_new.xlsx", "leaderboard.xlsx"]
+HISTORY_GLOBS = ["leaderboard_backup_*.xlsx", "leaderboard_from_vanpaper_*.xlsx", "reports/*.xlsx"]
+
+
+def _format_value(value):
+    """One canonical text form per value: ISO dates, integers without .0, '' for missing"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, (pd.Timestamp, datetime)):
+        if value.hour == 0 and value.minute == 0 and value.second == 0:
+            return value.strftime('%Y-%m-%d')
+        return value.strftime('%Y-%m-%dT%H:%M:%S')
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).replace("\r\n", "\n")
+
+
+def canonicalize(df):
+    """Return a string-only, stably sorted copy of an export"""
+    canonical = df.copy()
+    canonical.columns = [str(column).strip() for column in canonical.columns]
+    for column in canonical.columns:
+        canonical[column] = canonical[column].map(_format_value)
+
+    sort_keys = []
+    for column in SORT_COLUMNS:
+        if column in canonical.columns:
+            key = f"__sort_{column}"
+            # Customer numbers sort numerically; blanks go last
+            numeric = pd.to_numeric(canonical[column], errors="coerce") if column == "Customer Number" else None
+            canonical[key] = numeric if numeric is not None else canonical[column]
+            sort_keys.append(key)
+    if sort_keys:
+        canonical = canonical.sort_values(sort_keys, kind="mergesort", na_position="last")
+        canonical = canonical.drop(columns=sort_keys)
+    return canonical.reset_index(drop=True)
+
+
+def to_csv_text(df):
+    """Serialize a canonical frame with fixed quoting and line endings"""
+    return canonicalize(df).to_csv(index=False, lineterminator="\n")
+
+
+def write_canonical(source, out_path=CANONICAL_FILE):
+    """Write the canonical CSV for an xlsx path or DataFrame (atomically); returns its sha256"""
+    df = source if isinstance(source, pd.DataFrame) else pd.read_excel(source)
+    text = to_csv_text(df)
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = out_path.with_name(f".{out_path.name}.tmp")
+    with open(temp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, out_path)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_canonical(path):
+    """Load a canonical CSV with the same columns and dtypes the app gets from the xlsx"""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+    if "Last Invoice Date" in df.columns:
+        df["Last Invoice Date"] = pd.to_datetime(df["Last Invoice Date"], errors="coerce")
+    return df
+
+
+def read_export(path):
+    """Load the first five export columns (A:E) from either the xlsx or the canonical CSV"""
+    if Path(path).suffix.lower() == ".csv":
+        return load_canonical(path).iloc[:, :len(EXPORT_COLUMNS)]
+    return pd.read_excel(path, usecols="A:E", dtype={"A": str, "B": str, "E": str})
+
+
+# --- HISTORY REWRITE ---
+
+def _git(*args):
+    return subprocess.run(["git", *args], cwd=APP_DIR, capture_output=True, check=True).stdout
+
+
+def _git_versions():
+    """Yield (timestamp, label, xlsx bytes) for every committed version of the data files"""
+    for path in HISTORY_PATHS:
+        try:
+            log = _git("log", "--format=%H %ct", "--", path).decode().split("\n")
+        except (OSError, subprocess.CalledProcessError):
+            return
+        for line in log:
+            if not line.strip():
+                continue
+            commit, commit_time = line.split()
+            try:
+                blob = _git("show", f"{commit}:{path}")
+            except subprocess.CalledProcessError:
+                continue  # file deleted in this commit
+            yield datetime.fromtimestamp(int(commit_time)), f"{Path(path).stem}@{commit[:8]}", blob
+
+
+def _disk_versions():
+    """Yield (timestamp, label, xlsx bytes) for backups and stored reports on disk"""
+    for pattern in HISTORY_GLOBS:
+        for path in sorted(APP_DIR.glob(pattern)):
+            yield datetime.fromtimestamp(path.stat().st_mtime), path.stem, path.read_bytes()
+
+
+def rewrite_history(out_dir=HISTORY_DIR):
+    """Write one canonical CSV per distinct historical export; returns the files written"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    seen = {path.stem.rsplit("_", 1)[-1] for path in out_dir.glob("*.csv")}
+    written = []
+
+    for timestamp, label, blob in sorted([*_git_versions(), *_disk_versions()], key=lambda v: v[0]):
+        try:
+            text = to_csv_text(pd.read_excel(io.BytesIO(blob)))
+        except Exception as e:
+            print(f"⚠️ Skipping {label}: {e}")
+            continue
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        if digest in seen:
+            continue
+        seen.add(digest)
+        out_path = out_dir / f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{digest}.csv"
+        out_path.write_text(text, encoding="utf-8", newline="")
+        written.append(out_path)
+        print(f"✅ {label} -> {out_path.relative_to(APP_DIR)}")
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Canonical CSV form of Van Paper exports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="convert one xlsx export")
+    convert.add_argument("source")
+    convert.add_argument("out", nargs="?", default=str(CANONICAL_FILE))
+    history = commands.add_parser("rewrite-history",
+                                  help="write canonical CSVs for every committed and backed-up export")
+    history.add_argument("--out-dir", default=str(HISTORY_DIR))
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        sha256 = write_canonical(args.source, args.out)
+        print(f"✅ Wrote {args.out} ({sha256[:12]})")
+    else:
+        files = rewrite_history(args.out_dir)
+        print(f"📚 {len(files)} canonical history files written")
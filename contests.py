@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Contest Windows
+Contests live in contests.json: a date range plus optional "rules" (prize tiers,
+top prize, exclusions, violation keywords - see leaderboard_model.DEFAULT_RULES),
+given inline or as the path of a JSON file. Overlapping or back-to-back contests
+run from the same data; a customer counts toward a contest when the invoice
+date of its counted row falls inside the window.
+Ingest precomputes each rep's cumulative count per day (daily_counts.json), so the
+standings for any window or "as of" date are two lookups per rep instead of
+re-filtering and re-deduping the export.
+
+Usage:
+    python contests.py                          # standings for every contest
+    python contests.py --as-of 2025-11-01
+"""
+
+import argparse
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from leaderboard_model import compile_rules, compute, rank_label, standings_from_counts
+from publish import read_json, read_manifest, write_json_atomic
+
+APP_DIR = Path(__file__).parent
+CONTESTS_FILE = APP_DIR / "contests.json"
+DAILY_COUNTS_FILE = APP_DIR / "daily_counts.json"
+
+
+def load_contests(path=CONTESTS_FILE):
+    """Contests from contests.json with start/end as dates and compiled rules, in start order"""
+    path = Path(path)
+    contests = []
+    for contest in read_json(path).get('contests', []):
+        start, end = date.fromisoformat(contest['start']), date.fromisoformat(contest['end'])
+        if end < start:
+            raise ValueError(f"Contest {contest['id']} ends before it starts")
+        rules = contest.get('rules')
+        if isinstance(rules, str):
+            rules_path = path.parent / rules
+            rules = read_json(rules_path, default=None)
+            if not rules:
+                raise ValueError(f"Rules file {rules_path} for contest {contest['id']} is missing or empty")
+        contests.append({**contest, 'start': start, 'end': end,
+                         'rules': compile_rules(rules), 'rules_source': contest.get('rules')})
+    return sorted(contests, key=lambda contest: contest['start'])
+
+
+def contest_rules(contest=None):
+    """Rules of a contest, or of the current one when none is given"""
+    if contest is None:
+        contest = current_contest(load_contests())
+    return contest['rules'] if contest else compile_rules()
+
+
+def current_contest(contests, today=None):
+    """The running contest (latest start wins), else the one that ended most recently"""
+    today = today or date.today()
+    running = [contest for contest in contests if contest['start'] <= today <= contest['end']]
+    if running:
+        return running[-1]
+    finished = [contest for contest in contests if contest['end'] < today]
+    if finished:
+        return max(finished, key=lambda contest: contest['end'])
+    return contests[0] if contests else None
+
+
+def period_label(contest):
+    """September 19th - December 31st"""
+    start, end = contest['start'], contest['end']
+    return f"{start:%B} {rank_label(start.day)} - {end:%B} {rank_label(end.day)}"
+
+
+def split_window(counted, contest):
+    """(inside, outside): counted rows whose invoice date falls inside / outside the contest window"""
+    if len(counted) == 0:
+        return counted, counted
+    dates = counted["Last Invoice Date"].dt.date
+    inside = (dates >= contest['start']) & (dates <= contest['end'])
+    return counted[inside], counted[~inside]
+
+
+def in_window(counted, contest):
+    """Counted rows whose invoice date falls inside the contest window"""
+    return split_window(counted, contest)[0]
+
+
+# --- DAILY CUMULATIVE COUNTS ---
+
+def build_daily_counts(counted):
+    """{'start', 'days', 'reps': {rep: [cumulative count per day]}} from counted rows;
+    day i is start + i days and runs through the latest invoice date"""
+    dates = counted["Last Invoice Date"].dropna() if len(counted) else pd.Series(dtype="datetime64[ns]")
+    if len(dates) == 0:
+        return {'start': None, 'days': 0, 'reps': {}}
+
+    start = dates.min().date()
+    days = (dates.max().date() - start).days + 1
+    offsets = (counted["Last Invoice Date"].dt.normalize() - pd.Timestamp(start)).dt.days
+    per_day = pd.crosstab(counted["Salesrep"], offsets).reindex(columns=range(days), fill_value=0)
+    cumulative = per_day.cumsum(axis=1)
+    return {
+        'start': start.isoformat(),
+        'days': days,
+        'reps': {rep: [int(n) for n in row] for rep, row in cumulative.iterrows()},
+    }
+
+
+def write_daily_counts(df, canonical_sha256=None, path=DAILY_COUNTS_FILE, contests=None, sha256=None):
+    """Classify an export once per distinct rule set and store each contest's
+    cumulative counts (called by ingest). The canonical CSV's and the workbook's
+    hashes are kept so readers can tell which data the counts belong to."""
+    contests = load_contests() if contests is None else contests
+    by_rules = {}
+    counts = {'canonical_sha256': canonical_sha256, 'sha256': sha256, 'contests': {}}
+    for contest in contests:
+        key = json.dumps(contest['rules_source'], sort_keys=True)
+        if key not in by_rules:
+            by_rules[key] = build_daily_counts(compute(df, contest['rules'])['counted'])
+        counts['contests'][contest['id']] = by_rules[key]
+    write_json_atomic(path, counts)
+    return counts
+
+
+def read_daily_counts(path=DAILY_COUNTS_FILE, contests=None, data_sha256=None):
+    """Stored counts if they belong to the data and cover every contest, else None.
+
+    data_sha256 is the hash of the file that was actually loaded (the canonical CSV
+    or a workbook, e.g. one downloaded from a data server); without it the counts
+    are checked against the local manifest.
+    """
+    counts = read_json(path)
+    if not counts:
+        return None
+    if data_sha256 is not None:
+        if data_sha256 not in (counts.get('canonical_sha256'), counts.get('sha256')):
+            return None
+    elif counts.get('canonical_sha256') != read_manifest().get('canonical_sha256'):
+        return None
+    contests = load_contests() if contests is None else contests
+    if any(contest['id'] not in counts.get('contests', {}) for contest in contests):
+        return None
+    return counts
+
+
+def _cumulative_at(daily, day):
+    """Index into the cumulative lists for the end of `day` (-1 = before any invoice)"""
+    offset = (day - date.fromisoformat(daily['start'])).days
+    return min(offset, daily['days'] - 1)
+
+
+def window_counts(daily, start, end, as_of=None):
+    """Series of salesrep -> customers invoiced in [start, end] (up to as_of) - O(reps)"""
+    if not daily.get('reps'):
+        return pd.Series(dtype="int64")
+    last = min(end, as_of) if as_of else end
+    hi = _cumulative_at(daily, last)
+    lo = _cumulative_at(daily, start - timedelta(days=1))
+    counts = {}
+    for rep, cumulative in daily['reps'].items():
+        upper = cumulative[hi] if hi >= 0 else 0
+        lower = cumulative[lo] if lo >= 0 else 0
+        counts[rep] = upper - lower
+    return pd.Series(counts, dtype="int64")
+
+
+def contest_standings(daily_counts, contest, as_of=None):
+    """Ranked leaderboard with prizes for one contest window"""
+    daily = daily_counts.get('contests', {}).get(contest['id'], {})
+    return standings_from_counts(window_counts(daily, contest['start'], contest['end'], as_of),
+                                 contest['rules'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Standings per contest window")
+    parser.add_argument('--as-of', type=date.fromisoformat, help="YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+
+    daily = read_json(DAILY_COUNTS_FILE)
+    if not daily:
+        print("❌ daily_counts.json not found - it is written when a report is published")
+    for contest in load_contests():
+        print(f"\n🏆 {contest['name']} ({period_label(contest)})")
+        print(contest_standings(daily, contest, args.as_of).to_string(index=False))
@@ -5,14 +5,15 @@ Runs every 30 minutes during business hours and processes any new emails
 
 import win32com.client
 import os
-import shutil
-import subprocess
-import pandas as pd
 import configparser
 from datetime import datetime, timedelta
-from pathlib import Path
 import time
 
+from run_lock import run_exclusive
+from ingest import ingest_report, update_live_app
+from report_store import save_report
+from sync_metadata import record_sync
+
 def is_business_hours():
     """Check if it's currently business hours (7 AM - 4 PM, Mon-Fri)"""
     now = datetime.now()
@@ -104,43 +105,15 @@ def process_van_paper_email(email_data):
     """Process the Van Paper email and update the leaderboard"""
     
     try:
-        current_dir = Path(__file__).parent
-        
-        # Create timestamp for files
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save the Excel attachment
-        temp_excel = current_dir / f"vanpaper_temp_{timestamp}.xlsx"
-        email_data['attachment'].SaveAsFile(str(temp_excel))
-        
-        # Replace the main leaderboard file
-        main_leaderboard = current_dir / "leaderboard_new.xlsx"
-        if main_leaderboard.exists():
-            backup_name = f"leaderboard_backup_{timestamp}.xlsx"
-            backup_path = current_dir / backup_name
-            shutil.copy2(main_leaderboard, backup_path)
-        
-        shutil.copy2(temp_excel, main_leaderboard)
+        # Save the Excel attachment once, into the report store
+        snapshot = save_report(lambda path: email_data['attachment'].SaveAsFile(str(path)),
+                               email_data['received_time'])
         
-        # Save a timestamped copy
-        timestamped_copy = current_dir / f"leaderboard_from_vanpaper_{timestamp}.xlsx"
-        shutil.copy2(temp_excel, timestamped_copy)
-        
-        # Clean up
-        temp_excel.unlink()
+        # Publish it and record the sync with its row counts (hard link + atomic rename)
+        ingest_report(snapshot, email_data['received_time'])
         
         # Git update
-        git_commands = [
-            ["git", "add", "."],
-            ["git", "commit", "-m", f"Auto-update from Van Paper {email_data['received_time'].strftime('%I:%M %p')} on {email_data['received_time'].strftime('%Y-%m-%d')}"],
-            ["git", "push"]
-        ]
-        
-        for cmd in git_commands:
-            try:
-                subprocess.run(cmd, capture_output=True, text=True, cwd=current_dir, timeout=30)
-            except Exception:
-                pass
+        update_live_app(email_data['received_time'])
         
         return True
         
@@ -172,9 +145,11 @@ def main():
             with open("automation.log", "a") as f:
                 f.write(f"[{log_time}] ERROR: Failed to process Van Paper email\n")
     else:
-        # Log no emails found (but quietly)
+        # Log no emails found (but quietly) and note the check in the sync sidecar
+        record_sync()
         with open("automation.log", "a") as f:
             f.write(f"[{log_time}] INFO: No new Van Paper emails found\n")
 
 if __name__ == "__main__":
-    main()
+    # Skip if another run holds the lock - it picks up this queued request
+    run_exclusive("continuous_monitor", lambda triggers: main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Leaderboard Data Server
+Serves the live leaderboard data and its manifest over HTTP so the running
+Streamlit app can pick up new reports without a git push or redeploy.
+Responses carry ETag / Last-Modified headers; unchanged data costs a 304.
+
+Usage:
+    python data_server.py                    # serve this folder on port 8765
+    python data_server.py --dir some_folder --port 9000
+"""
+
+import argparse
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from publish import read_manifest
+
+APP_DIR = Path(__file__).parent
+
+# URL path -> (file name, content type)
+ROUTES = {
+    '/manifest.json': ('leaderboard_manifest.json', 'application/json'),
+    '/leaderboard.xlsx': ('leaderboard_new.xlsx',
+                          'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    '/sync_metadata.json': ('sync_metadata.json', 'application/json'),
+    '/leaderboard.html': ('leaderboard.html', 'text/html; charset=utf-8'),
+}
+
+
+def _etag(path, data_dir):
+    """Use the manifest's sha256 for the data file, a content hash for anything else"""
+    if path.name == ROUTES['/leaderboard.xlsx'][0]:
+        sha256 = read_manifest(data_dir / ROUTES['/manifest.json'][0]).get('sha256')
+        if sha256:
+            return f'"{sha256}"'
+    with open(path, "rb") as f:
+        return f'"{hashlib.sha256(f.read()).hexdigest()}"'
+
+
+class DataHandler(BaseHTTPRequestHandler):
+    data_dir = APP_DIR
+
+    def _send_file(self, include_body):
+        route = ROUTES.get(self.path.split('?', 1)[0])
+        if route is None:
+            self.send_error(404)
+            return
+
+        path = self.data_dir / route[0]
+        if not path.exists():
+            self.send_error(404, f"{route[0]} has not been published yet")
+            return
+
+        stat = path.stat()
+        etag = _etag(path, self.data_dir)
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+        if self._not_modified(etag, stat.st_mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+
+        self.send_response(200)
+        self.send_header('Content-Type', route[1])
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def do_GET(self):
+        self._send_file(include_body=True)
+
+    def do_HEAD(self):
+        self._send_file(include_body=False)
+
+    def log_message(self, format, *args):
+        if os.environ.get('VPSALES_DATA_SERVER_QUIET'):
+            return
+        super().log_message(format, *args)
+
+
+def serve(data_dir=APP_DIR, host='0.0.0.0', port=8765):
+    """Serve data_dir until interrupted"""
+    handler = type('BoundDataHandler', (DataHandler,), {'data_dir': Path(data_dir)})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"📡 Serving leaderboard data from {Path(data_dir).resolve()} on http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Data server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve leaderboard data for the Streamlit app")
+    parser.add_argument('--dir', default=str(APP_DIR), help="folder holding the live data and manifest")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    serve(args.dir, args.host, args.port)
@@ -0,0 +1,138 @@
+"""
+Leaderboard Data Source
+Tells the app which data file to load and which version it is.
+By default that is the local leaderboard_new.xlsx named by the manifest.
+When VPSALES_DATA_URL points at a data server, the manifest is polled with
+If-None-Match and a new file is downloaded into data_cache/ only when it changed,
+so new standings show up without a git push or an app restart.
+"""
+
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from publish import MAIN_LEADERBOARD, MANIFEST_FILE, read_manifest, write_json_atomic
+from sync_metadata import SIDECAR_FILE
+
+APP_DIR = Path(__file__).parent
+CACHE_DIR = APP_DIR / "data_cache"
+
+DATA_URL = os.environ.get("VPSALES_DATA_URL", "").rstrip("/")
+POLL_SECONDS = float(os.environ.get("VPSALES_DATA_POLL_SECONDS", "30"))
+REQUEST_TIMEOUT = 5
+
+_lock = threading.Lock()
+_remote = {'checked_at': 0.0, 'etag': None, 'path': None, 'version': None, 'sync_etag': None}
+
+
+def _local_version(manifest, path):
+    """Version key for a local file: manifest version + hash, or the file mtime"""
+    if manifest.get('sha256'):
+        return f"{manifest.get('version', 0)}-{manifest['sha256'][:12]}"
+    try:
+        return f"mtime-{path.stat().st_mtime_ns}"
+    except FileNotFoundError:
+        return "missing"
+
+
+def local_data(manifest_path=MANIFEST_FILE, live_path=MAIN_LEADERBOARD):
+    """Return (path, version) for the locally published data - the canonical CSV
+    named by the manifest when present (that is what git carries), else the workbook"""
+    manifest = read_manifest(manifest_path)
+    live_path = Path(live_path)
+    if manifest.get('canonical'):
+        canonical = live_path.with_name(manifest['canonical'])
+        if canonical.exists():
+            return canonical, _local_version(manifest, live_path)
+    return live_path, _local_version(manifest, live_path)
+
+
+def _fetch(url, etag=None):
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header('If-None-Match', etag)
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            return response.status, response.headers.get('ETag'), response.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, etag, None
+        raise
+
+
+def _download(url, sha256):
+    """Download the data file into data_cache/ (atomically) and drop older copies"""
+    CACHE_DIR.mkdir(exist_ok=True)
+    target = CACHE_DIR / f"leaderboard_{sha256[:12]}.xlsx"
+    if not target.exists():
+        status, _, body = _fetch(url)
+        temp_path = target.with_suffix(".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, target)
+    for old in CACHE_DIR.glob("leaderboard_*.xlsx"):
+        if old != target:
+            old.unlink(missing_ok=True)
+    return target
+
+
+def _poll_sync_metadata(base_url):
+    """Mirror the server's sync sidecar into data_cache/ when it changed"""
+    status, etag, body = _fetch(f"{base_url}/sync_metadata.json", _remote['sync_etag'])
+    if status == 304:
+        return
+    CACHE_DIR.mkdir(exist_ok=True)
+    write_json_atomic(CACHE_DIR / SIDECAR_FILE.name, json.loads(body))
+    _remote['sync_etag'] = etag
+
+
+def _poll_remote(base_url):
+    try:
+        _poll_sync_metadata(base_url)
+    except (OSError, ValueError):
+        pass
+    status, etag, body = _fetch(f"{base_url}/manifest.json", _remote['etag'])
+    if status == 304 and _remote['path'] is not None:
+        return
+    manifest = json.loads(body)
+    sha256 = manifest['sha256']
+    _remote['path'] = _download(f"{base_url}/leaderboard.xlsx", sha256)
+    _remote['version'] = f"{manifest.get('version', 0)}-{sha256[:12]}"
+    _remote['etag'] = etag
+
+
+def current_data(base_url=None, poll_seconds=None):
+    """Return (path, version) of the data the app should show right now.
+
+    Remote checks are rate-limited to one per poll interval per process; if the
+    server is unreachable the last downloaded copy (or the local file) is used.
+    """
+    base_url = (base_url if base_url is not None else DATA_URL).rstrip("/")
+    if not base_url:
+        return local_data()
+
+    poll_seconds = POLL_SECONDS if poll_seconds is None else poll_seconds
+    with _lock:
+        now = time.monotonic()
+        if _remote['path'] is None or now - _remote['checked_at'] >= poll_seconds:
+            _remote['checked_at'] = now
+            try:
+                _poll_remote(base_url)
+            except (OSError, ValueError, KeyError):
+                pass
+        if _remote['path'] is not None:
+            return _remote['path'], _remote['version']
+    return local_data()
+
+
+def sync_metadata_path():
+    """Sidecar to show in the footer: the mirrored copy when reading from a data server"""
+    if DATA_URL and (CACHE_DIR / SIDECAR_FILE.name).exists():
+        return CACHE_DIR / SIDECAR_FILE.name
+    return SIDECAR_FILE
@@ -4,11 +4,10 @@ Process the specific 11:16 AM email that was missed
 """
 
 import win32com.client
-import pandas as pd
-import os
 from datetime import datetime, timedelta
-import subprocess
-import shutil
+
+from ingest import ingest_report, update_live_app
+from report_store import save_report
 
 def force_process_1116_email():
     """Find and process the 11:16 AM Van Paper email specifically"""
@@ -71,58 +70,21 @@ def force_process_1116_email():
         
         print(f"📎 Processing attachment: {filename}")
         
-        # Save attachment temporarily
-        temp_path = os.path.join(os.getcwd(), f"temp_{filename}")
-        attachment.SaveAsFile(temp_path)
-        
-        print(f"💾 Saved to: {temp_path}")
-        
-        # Create backup of current file
-        current_file = "leaderboard_new.xlsx"
-        backup_name = f"leaderboard_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        if os.path.exists(current_file):
-            shutil.copy2(current_file, backup_name)
-            print(f"📋 Backed up current file to: {backup_name}")
-        
-        # Copy the new file
-        shutil.copy2(temp_path, current_file)
-        print(f"✅ Updated {current_file}")
-        
-        # Also save with timestamp for reference
-        timestamped_name = f"leaderboard_from_vanpaper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        shutil.copy2(temp_path, timestamped_name)
-        print(f"📁 Saved copy as: {timestamped_name}")
-        
-        # Clean up temp file
-        os.remove(temp_path)
-        
-        # Verify the data
-        try:
-            df = pd.read_excel(current_file)
-            print(f"📊 Data verification: {len(df)} rows loaded")
-            if len(df) > 0:
-                print(f"   First few customers: {', '.join(df.iloc[:3, 0].astype(str).tolist())}")
-        except Exception as e:
-            print(f"⚠️ Data verification failed: {e}")
-        
-        # Git update
+        # Save the attachment once, into the report store, and publish it - the live
+        # file becomes a hard link to the stored report and is never written in place
+        snapshot = save_report(lambda path: attachment.SaveAsFile(str(path)), target_email.ReceivedTime)
+        print(f"💾 Stored as reports/{snapshot.name}")
+        result = ingest_report(snapshot, target_email.ReceivedTime)
+        print(f"📊 Data verified: {result['rows']} rows loaded")
+        if result['unchanged']:
+            print(f"✅ No rows changed - live data kept (version {result['version']})")
+        else:
+            print(f"✅ Updated leaderboard_new.xlsx (version {result['version']})")
+        
+        # Git update - commits and pushes the published files
         print(f"\n🔄 Updating Git Repository...")
-        
-        git_commands = [
-            ["git", "add", "."],
-            ["git", "commit", "-m", f"Auto-update leaderboard from Van Paper email at {target_email.ReceivedTime.strftime('%I:%M %p')} on {target_email.ReceivedTime.strftime('%Y-%m-%d')}"],
-            ["git", "push"]
-        ]
-        
-        for cmd in git_commands:
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
-                print(f"✅ {' '.join(cmd)}: {result.returncode}")
-                if result.returncode != 0 and result.stderr:
-                    print(f"   Warning: {result.stderr.strip()}")
-            except Exception as e:
-                print(f"❌ Git command failed: {e}")
+        if not update_live_app(target_email.ReceivedTime):
+            print("⚠️ Git update failed - see the warning above")
         
         print(f"\n✅ Successfully processed 11:16 AM Van Paper email!")
         print(f"🔗 Live app will update at: https://vpsales.streamlit.app/")
@@ -0,0 +1,105 @@
+"""
+Van Paper Report Ingest
+Shared steps for turning a saved Van Paper attachment into live leaderboard data.
+Every automation script, the manual process_* scripts and the ingest daemon go
+through ingest_report() and update_live_app().
+"""
+
+import logging
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+
+from publish import PUBLISHED_FILES, SYNC_TIME_FILES
+from report_store import STORE_DIR, import_file, publish_report
+from retention import apply_retention
+from sync_metadata import record_sync
+
+APP_DIR = Path(__file__).parent
+MAIN_LEADERBOARD = APP_DIR / "leaderboard_new.xlsx"
+
+VANPAPER_SENDER = 'noreply@vanpaper.com'
+REPORT_KEYWORD = 'leaderboardexport'
+EXCEL_EXTENSIONS = ('.xlsx', '.xls', '.xlsm')
+
+
+def is_vanpaper_report(sender, subject):
+    """Check sender and subject against the Van Paper scheduled report"""
+    return (VANPAPER_SENDER in str(sender).lower() and
+            REPORT_KEYWORD in str(subject).lower())
+
+
+def find_excel_attachment(message):
+    """Return the first Excel attachment on a MailItem, or None"""
+    if message.Attachments.Count == 0:
+        return None
+    for attachment in message.Attachments:
+        if attachment.FileName.lower().endswith(EXCEL_EXTENSIONS):
+            return attachment
+    return None
+
+
+def ingest_report(report_path, received_time):
+    """Verify a report and make it the live leaderboard file.
+
+    Reports already saved into the store are published as-is; anything else
+    (e.g. a manually downloaded file) is imported into the store first.
+    """
+    snapshot = Path(report_path)
+    if snapshot.resolve().parent != STORE_DIR.resolve():
+        snapshot = import_file(snapshot, received_time)
+
+    # Verify the Excel file before touching the live data
+    df = pd.read_excel(snapshot)
+
+    # Link the live file to the stored snapshot and swap it in atomically
+    manifest = publish_report(snapshot, received_time)
+    record_sync(received_time, manifest['snapshot'], manifest['sha256'], df)
+
+    # Every script ingests through here, so this is the one place the store is
+    # trimmed. Housekeeping only - a failed archive must not fail the ingest
+    try:
+        apply_retention(verbose=False)
+    except Exception as e:
+        print(f"⚠️ Retention skipped: {e}")
+
+    return {
+        'rows': len(df),
+        'version': manifest['version'],
+        'received_time': received_time,
+        'snapshot': snapshot.name,
+        'unchanged': manifest.get('unchanged', False),
+    }
+
+
+def data_changed():
+    """True if any published file other than the sync time differs from the last commit"""
+    data_files = [name for name in PUBLISHED_FILES if name not in SYNC_TIME_FILES]
+    result = subprocess.run(["git", "status", "--porcelain", "--", *data_files],
+                            capture_output=True, text=True, cwd=APP_DIR, timeout=60)
+    return result.returncode != 0 or bool(result.stdout.strip())
+
+
+def update_live_app(received_time):
+    """Commit and push the new leaderboard file - skipped when only the sync time moved"""
+    if not data_changed():
+        logging.info("No published data changed - nothing to commit")
+        return True
+
+    git_commands = [
+        ["git", "add", *PUBLISHED_FILES],
+        ["git", "commit", "-m", f"Auto-update from Van Paper {received_time.strftime('%I:%M %p')} on {received_time.strftime('%Y-%m-%d')}"],
+        ["git", "push"]
+    ]
+
+    for cmd in git_commands:
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, cwd=APP_DIR, timeout=60)
+        except subprocess.TimeoutExpired:
+            logging.warning(f"{' '.join(cmd[:2])} timed out")
+            return False
+        if result.returncode != 0:
+            logging.warning(f"{' '.join(cmd[:2])} failed: {(result.stderr or result.stdout).strip()}")
+            return False
+    return True
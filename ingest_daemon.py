@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Van Paper Ingest Daemon
+Long-running replacement for the scheduled scans. Reacts to Outlook new-mail
+events (or new files in a watched folder for local testing) and processes a
+matching report within seconds, keeping Outlook and pandas loaded between events.
+
+Usage:
+    python ingest_daemon.py                  # Outlook new-mail events
+    python ingest_daemon.py --watch inbox_dir --no-git
+"""
+
+import argparse
+import configparser
+import logging
+import queue
+import shutil
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ingest import (APP_DIR, EXCEL_EXTENSIONS, MAIN_LEADERBOARD, find_excel_attachment,
+                    ingest_report, is_vanpaper_report, update_live_app)
+from report_store import save_report
+from run_lock import run_exclusive
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(APP_DIR / 'ingest_daemon.log'),
+        logging.StreamHandler()
+    ]
+)
+
+# How far back to look for reports that arrived while the daemon was down
+CATCH_UP_HOURS = 3
+
+# Seconds to wait for another run's lock before logging and waiting again
+LOCK_TIMEOUT = 600
+
+
+def load_auto_update_git():
+    """Read AUTO_UPDATE_GIT from automation_config.txt (defaults to True)"""
+    config = configparser.ConfigParser()
+    config.read(APP_DIR / "automation_config.txt")
+    return config.getboolean('AUTOMATION_SETTINGS', 'AUTO_UPDATE_GIT', fallback=True)
+
+
+class OutlookEvents:
+    """Outlook.Application event sink - queues EntryIDs of newly delivered mail"""
+
+    new_mail = queue.Queue()
+
+    def OnNewMailEx(self, entry_ids):
+        for entry_id in str(entry_ids).split(','):
+            if entry_id:
+                OutlookEvents.new_mail.put(entry_id)
+
+
+class OutlookBackend:
+    """Yields Van Paper reports as Outlook delivers them"""
+
+    def __init__(self, pump_interval=0.5):
+        import pythoncom
+        import win32com.client
+
+        self.pythoncom = pythoncom
+        self.pump_interval = pump_interval
+        self.outlook = win32com.client.DispatchWithEvents("Outlook.Application", OutlookEvents)
+        self.namespace = self.outlook.GetNamespace("MAPI")
+        self.inbox = self.namespace.GetDefaultFolder(6)
+        logging.info("Connected to Outlook - listening for new mail")
+
+    def _catch_up(self):
+        """Queue reports that arrived after the live file was last written"""
+        from mailbox_table import fetch_message_rows
+
+        since = datetime.now() - timedelta(hours=CATCH_UP_HOURS)
+        if MAIN_LEADERBOARD.exists():
+            since = max(since, datetime.fromtimestamp(MAIN_LEADERBOARD.stat().st_mtime))
+
+        rows = fetch_message_rows(self.inbox, start_time=since)
+        for row in reversed(rows):  # oldest first
+            if row['has_attachments'] and is_vanpaper_report(row['sender'], row['subject']):
+                OutlookEvents.new_mail.put(row['entry_id'])
+
+    def _to_report(self, entry_id):
+        message = self.namespace.GetItemFromID(entry_id)
+        if not is_vanpaper_report(getattr(message, 'SenderEmailAddress', ''),
+                                  getattr(message, 'Subject', '')):
+            return None
+        attachment = find_excel_attachment(message)
+        if attachment is None:
+            return None
+        received_time = message.ReceivedTime.replace(tzinfo=None)
+        return {
+            'received_time': received_time,
+            'filename': attachment.FileName,
+            'save_as': lambda path: attachment.SaveAsFile(str(path)),
+        }
+
+    def reports(self):
+        self._catch_up()
+        seen = set()
+        while True:
+            self.pythoncom.PumpWaitingMessages()
+            try:
+                entry_id = OutlookEvents.new_mail.get_nowait()
+            except queue.Empty:
+                time.sleep(self.pump_interval)
+                continue
+
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+
+            try:
+                report = self._to_report(entry_id)
+            except Exception as e:
+                logging.warning(f"Could not read new mail item: {e}")
+                continue
+            if report:
+                yield report
+
+
+class DirectoryWatchBackend:
+    """Yields Excel files dropped into a folder - local stand-in for Outlook"""
+
+    def __init__(self, watch_dir, poll_interval=1.0):
+        self.watch_dir = Path(watch_dir)
+        self.processed_dir = self.watch_dir / "processed"
+        self.poll_interval = poll_interval
+        self.processed_dir.mkdir(parents=True, exist_ok=True)
+        logging.info(f"Watching {self.watch_dir} for new reports")
+
+    def _stable_files(self, sizes):
+        """Return files whose size did not change since the last poll"""
+        ready = []
+        current = {}
+        for path in sorted(self.watch_dir.iterdir()):
+            if not path.is_file() or not path.name.lower().endswith(EXCEL_EXTENSIONS):
+                continue
+            size = path.stat().st_size
+            current[path] = size
+            if sizes.get(path) == size:
+                ready.append(path)
+        sizes.clear()
+        sizes.update(current)
+        return ready
+
+    def _take(self, src, target):
+        """Copy a dropped file into place and move it out of the watch folder"""
+        shutil.copy2(src, target)
+        src.replace(self.processed_dir / src.name)
+
+    def reports(self):
+        sizes = {}
+        while True:
+            for path in self._stable_files(sizes):
+                yield {
+                    'received_time': datetime.fromtimestamp(path.stat().st_mtime),
+                    'filename': path.name,
+                    'save_as': lambda target, src=path: self._take(src, target),
+                }
+                sizes.pop(path, None)
+            time.sleep(self.poll_interval)
+
+
+def handle_report(report, auto_update_git=True):
+    """Save, ingest and publish a single report"""
+    started = time.monotonic()
+
+    try:
+        snapshot = save_report(report['save_as'], report['received_time'])
+        result = ingest_report(snapshot, report['received_time'])
+    except Exception as e:
+        logging.error(f"Failed to ingest {report['filename']}: {e}")
+        return False
+
+    logging.info(f"Ingested {report['filename']} received {report['received_time'].strftime('%I:%M %p')} "
+                 f"({result['rows']} rows{', no changes' if result['unchanged'] else ''})")
+
+    if auto_update_git and not update_live_app(report['received_time']):
+        logging.warning("Live app update had issues")
+
+    logging.info(f"Report processed in {time.monotonic() - started:.1f}s")
+    return True
+
+
+def run_daemon(backend, auto_update_git=True):
+    """Process reports from a backend until interrupted"""
+    try:
+        for report in backend.reports():
+            # Wait out any scheduled or manual run that is already writing files
+            # merge=False: this report is ingested by this call, never folded into a scan.
+            # The backend has already marked the report as seen, so keep waiting until
+            # the lock is ours rather than dropping it on a timeout.
+            while True:
+                ran, _ = run_exclusive("ingest_daemon",
+                                       lambda triggers, r=report: handle_report(r, auto_update_git=auto_update_git),
+                                       wait=True, timeout=LOCK_TIMEOUT, merge=False)
+                if ran:
+                    break
+                logging.warning(f"Automation lock still busy after {LOCK_TIMEOUT}s - "
+                                f"{report['filename']} not ingested yet, waiting again")
+    except KeyboardInterrupt:
+        logging.info("Ingest daemon stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Van Paper ingest daemon")
+    parser.add_argument('--watch', metavar='DIR',
+                        help="watch a folder for Excel files instead of Outlook")
+    parser.add_argument('--no-git', action='store_true',
+                        help="do not commit and push after ingesting")
+    args = parser.parse_args()
+
+    auto_update_git = load_auto_update_git() and not args.no_git
+
+    if args.watch:
+        backend = DirectoryWatchBackend(args.watch)
+    else:
+        backend = OutlookBackend()
+
+    run_daemon(backend, auto_update_git=auto_update_git)
+
+
+if __name__ == "__main__":
+    main()
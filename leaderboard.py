@@ -1,13 +1,26 @@
 import streamlit as st
 import pandas as pd
 from PIL import Image
-import base64
 from datetime import datetime
 from zoneinfo import ZoneInfo  # For Central Time
-from fuzzywuzzy import fuzz
-from st_aggrid import AgGrid, GridOptionsBuilder
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+import os
 import time
 
+from canonical_export import read_export
+from contests import (contest_rules, contest_standings, current_contest, load_contests, period_label,
+                      read_daily_counts, split_window)
+from data_source import current_data, sync_metadata_path
+from leaderboard_model import LeaderboardModel, build_standings, classify, prepare, prize_descriptions
+from perf_trace import Trace, record, recent_runs, span_table
+from publish import file_sha256
+from report_diff import changes_since, describe
+from search_index import build_index, search
+from snapshot_store import read_snapshot_index, standings_as_of
+from static_assets import logo_img_tag
+from timeline import read_timeline
+from sync_metadata import read_sync_metadata
+
 # Initialize session state for winner popup - hide for now
 if 'show_winner_popup' not in st.session_state:
     st.session_state.show_winner_popup = False
@@ -59,19 +72,30 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- LOGO BLOCK ---
-logo_path = "0005.jpg"
-encoded_logo = base64.b64encode(open(logo_path, "rb").read()).decode()
+# Pre-resized variants served from static/ (the browser caches them), not base64 per rerun
 st.markdown(f"""
 <div id="logo-block">
-    <img src="data:image/jpeg;base64,{encoded_logo}" class="logo-img" />
+    {logo_img_tag()}
 </div>
 """, unsafe_allow_html=True)
 
 # --- MAIN CONTENT BLOCK ---
 st.markdown('<div id="main-block">', unsafe_allow_html=True)
 
+# --- CONTEST WINDOW ---
+# Date ranges come from contests.json; only offer a choice when more than one is configured
+contests = load_contests()
+contest = current_contest(contests)
+if len(contests) > 1:
+    contest = st.selectbox("Contest", contests, index=contests.index(contest),
+                           format_func=lambda c: f"{c['name']} ({period_label(c)})")
+incentive_period = period_label(contest) if contest else "September 19th - December 31st"
+rules = contest_rules(contest)
+prize_items = "\n".join(f"        <li><strong>{title}:</strong> {text}</li>"
+                        for title, text in prize_descriptions(rules))
+
 # --- OVERVIEW SECTION ---
-st.markdown("""
+st.markdown(f"""
 <div style='
     background-color: #F8F9FA; 
     border-left: 4px solid #6C757D; 
@@ -82,14 +106,13 @@ st.markdown("""
 '>
     <h3 style='margin-top: 0; color: #495057;'>Incentive Overview</h3>
     <ul style='margin-bottom: 15px;'>
-        <li><strong>$50 Bonus:</strong> For every rep who secures 3+ new accounts</li>
-        <li><strong>$100 Top Performer:</strong> Additional prize for the rep with the most new accounts</li>
+{prize_items}
     </ul>
     <div style='font-size: 11px; color: #999; border-top: 1px solid #ddd; padding-top: 12px; margin-top: 12px; line-height: 1.4;'>
         <strong>Note:</strong> New ownership, new management, and name changes do not count as new accounts. Accounts must have at least 1 order to qualify. Additional ship-tos or separate customers associated with the same primary business do not count as additional customers.
     </div>
     <div style='margin-top: 15px; text-align: center; font-weight: bold; color: #666;'>
-        📅 Incentive Period: September 19th - December 31st
+        📅 Incentive Period: {incentive_period}
     </div>
 </div>
 """, unsafe_allow_html=True)
@@ -98,272 +121,331 @@ st.markdown("""
 st.markdown("<h3 style='margin-bottom: 0.5rem; color: #333; font-family: Futura, sans-serif;'>🏆 Current Standings</h3>", unsafe_allow_html=True)
 
 # --- LOAD DATA ---
-excel_path = "leaderboard_new.xlsx"  # Using fresh Van Paper data from 8:55 AM email
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_changes_since(since, data_version):
+    """Change log entries since a time - the log only grows when a report is published"""
+    return changes_since(datetime.strptime(since, '%Y-%m-%d %H:%M:%S'))
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_timeline(data_version):
+    """Daily standings series - rewritten by ingest only when a report is published"""
+    return read_timeline()
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_model(path, data_version, contest_id):
+    """The computed leaderboard for one data version, built once per process and shared
+    read-only by every session. New data gets a new key, so sessions switch to the new
+    model as a whole on their next rerun while the old one is never modified."""
+    contest = next((c for c in load_contests() if c['id'] == contest_id), None)
+    rules = contest_rules(contest)
+    trace = Trace("model", version=data_version)
 
-try:
     # Read the Excel file with the correct column names
-    df = pd.read_excel(excel_path, usecols="A:E", dtype={"A": str, "B": str, "E": str})
-    
-    # Use the actual column names from your Excel file
-    df.columns = ["Customer Name", "Salesperson", "Prospect", "Last Invoice Date", "Customer Number"]
-    
-    # Rename to match our internal naming convention
-    df = df.rename(columns={
-        "Customer Name": "New Customer",
-        "Salesperson": "Salesrep",
-        "Customer Number": "Customer Number",
-        "Prospect": "Rule Violation"
-    })
-    
-    df = df.dropna(subset=["New Customer", "Salesrep"])
-    
+    with trace.span("read") as span:
+        raw = read_export(path)
+        span['rows'] = len(raw)
+    with trace.span("clean") as span:
+        df = prepare(raw, rules)
+        span['rows'] = len(df)
     if len(df) == 0:
-        st.error("No valid data found after removing empty rows")
-        st.stop()
-    
-    df = df[df["Salesrep"].str.strip().str.lower() != "house account"]
-    
-    # Exclude salesrep with initials KCV from leaderboard eligibility
-    df = df[~df["Salesrep"].str.upper().str.contains("KCV", na=False)]
-    
-    df["Last Invoice Date"] = pd.to_datetime(df["Last Invoice Date"], errors="coerce")
-    
-    # Convert Rule Violation to string and handle NaN values  
-    df["Rule Violation"] = df["Rule Violation"].astype(str)
-    df["Rule Violation"] = df["Rule Violation"].replace("nan", "")
-
-    # Clean customer names
-    df["Cleaned Customer"] = df["New Customer"].str.lower()
-    df["Cleaned Customer"] = df["Cleaned Customer"].str.replace(r'[^\w\s]', '', regex=True)
-    df["Cleaned Customer"] = df["Cleaned Customer"].str.replace(r'\s+', ' ', regex=True).str.strip()
-
-    used_customers = set()
-    kept_rows = []
-    pending_rows = []
-    violation_rows = []
-
-    # We'll iterate through all rows, grouping customers by fuzzy matches (token_set_ratio) >= 90
-    # ONLY within the same salesrep - duplicates are per-salesrep, not across all salesreps
-    for salesrep in df["Salesrep"].unique():
-        salesrep_df = df[df["Salesrep"] == salesrep].copy()
-        used_customers_for_rep = set()
-        
-        for i, row in salesrep_df.iterrows():
-            cust_name = row["Cleaned Customer"]
-            if cust_name in used_customers_for_rep:
+        empty = pd.DataFrame()
+        record(trace)
+        return LeaderboardModel(data_version, empty, empty, empty, build_standings(empty, rules), 0, contest_id)
+
+    with trace.span("dedupe") as span:
+        df_cleaned, df_pending, df_violations = classify(df, rules, stats=span)
+        span.update(counted=len(df_cleaned), pending=len(df_pending), violations=len(df_violations))
+
+    with trace.span("rank") as span:
+        # Only invoices inside the contest window count; the others stay listed
+        # with an "Outside window" status instead of disappearing
+        df_outside = None
+        if contest:
+            df_cleaned, df_outside = split_window(df_cleaned, contest)
+
+        # Per-day cumulative counts precomputed at ingest: the window's standings are a
+        # lookup per rep. Fall back to counting here when they don't match the file that
+        # was loaded (e.g. newer data from VPSALES_DATA_URL than the local counts).
+        daily_counts = read_daily_counts(data_sha256=file_sha256(path))
+        if contest and daily_counts is not None:
+            leaderboard = contest_standings(daily_counts, contest)
+        else:
+            leaderboard = build_standings(df_cleaned, rules)
+        span.update(reps=len(leaderboard), precomputed=bool(contest and daily_counts is not None))
+
+    with trace.span("customer table"):
+        model = LeaderboardModel(data_version, df_cleaned, df_pending, df_violations, leaderboard, len(df),
+                                 contest_id, outside=df_outside)
+    record(trace)
+    return model
+
+# --- CUSTOMER LISTS ---
+# Customers shown per page of an open rep list
+PAGE_SIZE = 25
+
+# Tab label, heading, message when the list is empty
+CUSTOMER_TABS = [
+    ("🏆 New Customers", "Customers Counted Toward New Customer Goals", "No new customers found."),
+    ("⏲ Pending Customers", "Customers Not Yet Counted", "No pending customers! 🎉"),
+    ("❌ Rule Violations", "Customers Excluded Due to Rule Violations", "No rule violations found! ✅"),
+]
+
+def customer_line(row, list_name):
+    """• **Name (number)** - *Invoice: date / Awaiting first invoice / reason*"""
+    customer_num = row["Customer Number"] if pd.notna(row["Customer Number"]) else "N/A"
+    customer_display = f"{row['New Customer']} ({customer_num})"
+    if list_name == "pending":
+        return f"• **{customer_display}** - *Awaiting first invoice*"
+    if list_name == "outside":
+        return f"• **{customer_display}** - *Invoice: {row['Last Invoice Date'].strftime('%m/%d/%Y')} - outside contest window*"
+    # Reason code assigned by the violation classifier at load time
+    detail = row.get("Violation Reason") if list_name == "violations" else row["Last Invoice Date"]
+    if pd.isna(detail):
+        return f"• **{customer_display}**"
+    if list_name == "violations":
+        return f"• **{customer_display}** - *{detail}*"
+    return f"• **{customer_display}** - *Invoice: {detail.strftime('%m/%d/%Y')}*"
+
+def rep_lists(df, list_name, empty_message):
+    """One expander per rep; a rep's customers are rendered only while it is open, a page at a time"""
+    if df.empty:
+        st.info(empty_message)
+        return
+    for salesrep, group_df in df.groupby("Salesrep"):
+        key = f"{list_name}_{salesrep}"
+        with st.expander(f"**{salesrep}** ({len(group_df)} customers)", key=key, on_change="rerun") as rep_expander:
+            if not rep_expander.open:
                 continue
-
-            # Find all rows for THIS salesrep with fuzzy token_set_ratio >= 90
-            matches = salesrep_df[salesrep_df["Cleaned Customer"].apply(lambda x: fuzz.token_set_ratio(x, cust_name) >= 90)].copy()
-
-            # Mark all matched cleaned customers as used for this salesrep
-            used_customers_for_rep.update(matches["Cleaned Customer"].tolist())
-
-            # Check if any matches have rule violations
-            # For now, treat "Prospect" values as valid customers, not violations
-            # Real violations would be specific text like "Duplicate", "Invalid", etc.
-            matches_with_violations = matches[
-                (matches["Rule Violation"] != "") & 
-                (matches["Rule Violation"] != "nan") & 
-                (matches["Rule Violation"] != "Prospect") &
-                (matches["Rule Violation"].str.contains("violation|duplicate|invalid|exclude", case=False, na=False))
-            ]
-            if not matches_with_violations.empty:
-                # If there's a rule violation, add to violation list
-                best_violation = matches_with_violations.iloc[0]
-                violation_rows.append(best_violation)
-            else:
-                # If no explicit violations, process normally
-                # If any matched rows have an invoice date, pick the latest one for keeping
-                matches_with_invoice = matches[~matches["Last Invoice Date"].isna()]
-                if not matches_with_invoice.empty:
-                    best_match = matches_with_invoice.sort_values(by="Last Invoice Date", ascending=False).iloc[0]
-                    kept_rows.append(best_match)
-                    
-                    # Add any remaining matches as duplicates/violations
-                    remaining_matches = matches[matches.index != best_match.name]
-                    for _, duplicate_row in remaining_matches.iterrows():
-                        violation_rows.append(duplicate_row)
-                else:
-                    # If none have invoice dates, just take the first match row
-                    best_match = matches.iloc[0]
-                    pending_rows.append(best_match)
-                    
-                    # Add any remaining matches as duplicates/violations
-                    remaining_matches = matches[matches.index != best_match.name]
-                    for _, duplicate_row in remaining_matches.iterrows():
-                        violation_rows.append(duplicate_row)
-
-    df_cleaned = pd.DataFrame(kept_rows)
-    df_pending = pd.DataFrame(pending_rows)
-    df_violations = pd.DataFrame(violation_rows)
-    
-    # Exclude salesrep "Van, Kyle C" (KCV) from leaderboard eligibility
-    if len(df_cleaned) > 0:
-        df_cleaned = df_cleaned[~df_cleaned["Salesrep"].str.contains("Van, Kyle", case=False, na=False)]
-
-    if len(df_cleaned) == 0:
-        st.warning("No customers with invoices found for leaderboard")
-        leaderboard = pd.DataFrame(columns=["Rank", "Salesrep", "Number of New Customers", "Prize"])
-        max_customers = 0
-    else:
-        leaderboard = df_cleaned.groupby("Salesrep")["New Customer"].nunique().reset_index()
-        leaderboard = leaderboard.rename(columns={"New Customer": "Number of New Customers"})
-        leaderboard = leaderboard.sort_values(by="Number of New Customers", ascending=False).reset_index(drop=True)
-
-        # Calculate prizes
-        max_customers = leaderboard["Number of New Customers"].max()
-        first_place_winners = leaderboard[leaderboard["Number of New Customers"] == max_customers]
-        num_first_place = len(first_place_winners)
-
-        # Prize per first place winner (split $100 among ties)
-        first_place_prize_each = 100 / num_first_place if num_first_place > 0 else 0
-
-        def calc_prize(row):
-            prize = 0
-            if row["Number of New Customers"] >= 3:
-                prize += 50
-            if row["Number of New Customers"] == max_customers:
-                prize += first_place_prize_each
-            return prize
-
-        leaderboard["Prize"] = leaderboard.apply(calc_prize, axis=1)
-
-        # Format Prize column with $ symbol and no decimals if whole number
-        leaderboard["Prize"] = leaderboard["Prize"].apply(lambda x: f"${int(x)}" if x.is_integer() else f"${x:.2f}")
-
-        # Create rank labels with ties
-        ranks_numeric = leaderboard["Number of New Customers"].rank(method='min', ascending=False).astype(int)
-        suffixes = {1: "st", 2: "nd", 3: "rd"}
-
-        def rank_label(n):
-            if 10 <= n % 100 <= 20:
-                return f"{n}th"
-            return f"{n}{suffixes.get(n % 10, 'th')}"
-
-        ranks = ranks_numeric.apply(rank_label)
-        
-        # Only insert Rank column if it doesn't already exist
-        if "Rank" not in leaderboard.columns:
-            leaderboard.insert(0, "Rank", ranks)
-
-    # Streamlined Leaderboard Display
-    if len(leaderboard) > 0:
-        for i, row in leaderboard.iterrows():
-            rank = row["Rank"]
-            salesrep = row["Salesrep"]
-            customers = row["Number of New Customers"]
-            prize = row["Prize"]
-            
-            # Special styling for first place
-            is_first_place = customers == max_customers
-            
-            if is_first_place:
-                # First place gets special styling
-                if rank == "1st":
-                    emoji = "🥇"
-                    name_color = "#DAA520"
-                elif rank == "2nd":
-                    emoji = "🥈"
-                    name_color = "#C0C0C0"
-                elif rank == "3rd":
-                    emoji = "🥉"
-                    name_color = "#CD7F32"
-                else:
-                    emoji = "🏆"
-                    name_color = "#DAA520"
-                name_weight = "bold"
-            else:
-                emoji = ""
-                name_color = "#333"
-                name_weight = "normal"
-            
-            # Create compact row
-            st.markdown(f"""
-            <div style="
-                display: flex; 
-                justify-content: space-between; 
-                align-items: center;
-                padding: 8px 12px;
-                margin: 4px 0;
-                background-color: {'#FFF9E6' if is_first_place else '#FAFAFA'};
-                border-left: 4px solid {'#FFD700' if is_first_place else '#E0E0E0'};
-                border-radius: 4px;
-            ">
-                <div style="display: flex; align-items: center; flex: 1;">
-                    <span style="font-size: 16px; margin-right: 8px; width: 20px;">{emoji}</span>
-                    <span style="font-size: 16px; font-weight: bold; color: #666; margin-right: 12px; min-width: 30px;">{rank}</span>
-                    <span style="font-size: 18px; font-weight: {name_weight}; color: {name_color};">{salesrep}</span>
-                </div>
-                <div style="display: flex; align-items: center; gap: 20px;">
-                    <div style="text-align: center;">
-                        <span style="font-size: 18px; font-weight: bold; color: #2E8B57;">{customers}</span>
-                        <span style="font-size: 12px; color: #666; margin-left: 4px;">customers</span>
-                    </div>
-                    <div style="text-align: right; min-width: 60px;">
-                        <span style="font-size: 16px; font-weight: bold; color: #228B22;">{prize}</span>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-    # Add spacing between leaderboard and customer details
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    st.markdown("---")
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    # --- TABBED DATA SECTION ---
-    tab1, tab2, tab3 = st.tabs(["🏆 New Customers", "⏲ Pending Customers", "❌ Rule Violations"])
-    
-    with tab1:
-        st.markdown("### Customers Counted Toward New Customer Goals")
-        
-        if not df_cleaned.empty:
-            for salesrep, group_df in df_cleaned.groupby("Salesrep"):
-                with st.expander(f"**{salesrep}** ({len(group_df)} customers)", expanded=False):
-                    for _, row in group_df.iterrows():
-                        customer_num = row["Customer Number"] if pd.notna(row["Customer Number"]) else "N/A"
-                        customer_display = f"{row['New Customer']} ({customer_num})"
-                        invoice_date = row["Last Invoice Date"]
-                        if pd.notna(invoice_date):
-                            date_str = invoice_date.strftime("%m/%d/%Y")
-                            st.markdown(f"• **{customer_display}** - *Invoice: {date_str}*")
+            rows = group_df
+            if len(group_df) > PAGE_SIZE:
+                pages = -(-len(group_df) // PAGE_SIZE)
+                page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key=f"{key}_page")
+                rows = group_df.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+            st.markdown("  \n".join(customer_line(row, list_name) for _, row in rows.iterrows()))
+
+@st.fragment
+def customer_tabs(df_cleaned, df_pending, df_violations, df_outside):
+    """The three customer tabs. Only the open tab is built, and opening a tab, a rep or
+    a page reruns just this fragment - not the standings above it."""
+    lists = [("counted", df_cleaned), ("pending", df_pending), ("violations", df_violations)]
+    tabs = st.tabs([label for label, _, _ in CUSTOMER_TABS], key="customer_tab", on_change="rerun")
+    for tab, (list_name, df), (_, heading, empty_message) in zip(tabs, lists, CUSTOMER_TABS):
+        with tab:
+            if tab.open:
+                st.markdown(f"### {heading}")
+                rep_lists(df, list_name, empty_message)
+                if list_name == "counted" and len(df_outside) > 0:
+                    st.markdown("### Invoiced Outside the Contest Window")
+                    st.caption("First invoiced before or after the contest period, so not counted in the standings")
+                    rep_lists(df_outside, "outside", "")
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_search_index(path, data_version, contest_id):
+    """Trigram index over the shared model's customers - built once per data version"""
+    return build_index(load_model(path, data_version, contest_id).customers)
+
+# Same markers as the customer tabs
+STATUS_ICONS = {"Counted": "🏆", "Pending": "⏲", "Violation": "❌", "Outside window": "📅"}
+
+@st.fragment
+def customer_search(customers, index):
+    """Search box that answers while typing; only this fragment reruns per keystroke pause"""
+    query = st.text_input("🔍 Find a customer", key="customer_search", type="search", live="200ms",
+                          placeholder="Customer name, customer number or rep")
+    if not query:
+        return
+    matches = search(index, customers, query)
+    if len(matches) == 0:
+        st.caption(f"No customers match \"{query}\"")
+        return
+    st.markdown("  \n".join(
+        f"• {STATUS_ICONS[row['Status']]} **{row['Customer']} ({row['Customer Number'] or 'N/A'})** - "
+        f"{row['Salesrep']} - *{row['Status']}*"
+        for _, row in matches.iterrows()))
+
+@st.fragment
+def customer_grid(customers):
+    """Every customer in one AgGrid, sent once when opened (Arrow, columnar); filtering,
+    sorting and scrolling then happen in the browser over virtualized rows"""
+    with st.expander(f"📋 All Customers ({len(customers)})", key="customer_grid", on_change="rerun") as grid_expander:
+        if not grid_expander.open:
+            return
+        builder = GridOptionsBuilder.from_dataframe(customers)
+        builder.configure_default_column(filter=True, sortable=True, resizable=True, floatingFilter=True)
+        # Fixed height keeps row virtualization on (autoHeight would render every row)
+        builder.configure_grid_options(rowBuffer=10, animateRows=False)
+        AgGrid(customers, gridOptions=builder.build(), height=420,
+               update_mode=GridUpdateMode.NO_UPDATE, update_on=[],
+               use_json_serialization=False, key="customer_grid_table")
+
+# --- AUTO REFRESH ---
+# Seconds between data version checks on an open page (0 turns auto-refresh off)
+REFRESH_SECONDS = float(os.environ.get("VPSALES_REFRESH_SECONDS", "60")) or None
+
+@st.fragment
+def live_results(contest_id):
+    """Standings, search, customer tabs and history for the current data version.
+
+    Redrawn when the page runs; watch_version() reruns the page once a new version
+    is published, so the refresh timer never redraws unchanged results.
+    """
+    # Local leaderboard_new.csv/.xlsx, or the data server when VPSALES_DATA_URL is set
+    excel_path, data_version = current_data()
+    st.session_state.data_version = data_version
+    trace = Trace("render", version=data_version)
+
+    try:
+        with trace.span("model"):
+            model = load_model(str(excel_path), data_version, contest_id)
+
+        if model.rows == 0:
+            st.error("No valid data found after removing empty rows")
+            st.stop()
+
+        df_cleaned, df_pending, df_violations = model.counted, model.pending, model.violations
+        leaderboard = model.standings
+        max_customers = model.max_customers
+        if len(df_cleaned) == 0:
+            st.warning("No customers with invoices found for leaderboard")
+
+        with trace.span("standings", reps=len(leaderboard)):
+            # Streamlined Leaderboard Display
+            if len(leaderboard) > 0:
+                for i, row in leaderboard.iterrows():
+                    rank = row["Rank"]
+                    salesrep = row["Salesrep"]
+                    customers = row["Number of New Customers"]
+                    prize = row["Prize"]
+
+                    # Special styling for first place
+                    is_first_place = customers == max_customers
+
+                    if is_first_place:
+                        # First place gets special styling
+                        if rank == "1st":
+                            emoji = "🥇"
+                            name_color = "#DAA520"
+                        elif rank == "2nd":
+                            emoji = "🥈"
+                            name_color = "#C0C0C0"
+                        elif rank == "3rd":
+                            emoji = "🥉"
+                            name_color = "#CD7F32"
                         else:
-                            st.markdown(f"• **{customer_display}**")
-        else:
-            st.info("No new customers found.")
-    
-    with tab2:
-        st.markdown("### Customers Not Yet Counted")
-        
-        if not df_pending.empty:
-            for salesrep, group_df in df_pending.groupby("Salesrep"):
-                with st.expander(f"**{salesrep}** ({len(group_df)} customers)", expanded=False):
-                    for _, row in group_df.iterrows():
-                        customer_num = row["Customer Number"] if pd.notna(row["Customer Number"]) else "N/A"
-                        customer_display = f"{row['New Customer']} ({customer_num})"
-                        st.markdown(f"• **{customer_display}** - *Awaiting first invoice*")
-        else:
-            st.info("No pending customers! 🎉")
-    
-    with tab3:
-        st.markdown("### Customers Excluded Due to Rule Violations")
-        
-        if not df_violations.empty:
-            for salesrep, group_df in df_violations.groupby("Salesrep"):
-                with st.expander(f"**{salesrep}** ({len(group_df)} customers)", expanded=False):
-                    for _, row in group_df.iterrows():
-                        customer_num = row["Customer Number"] if pd.notna(row["Customer Number"]) else "N/A"
-                        customer_display = f"{row['New Customer']} ({customer_num})"
-                        # Just show the customer name and number, no violation reason
-                        st.markdown(f"• **{customer_display}**")
-        else:
-            st.info("No rule violations found! ✅")
-
-except FileNotFoundError:
-    st.error(f"File not found: {excel_path}")
-except Exception as e:
-    st.error(f"An error occurred: {e}")
+                            emoji = "🏆"
+                            name_color = "#DAA520"
+                        name_weight = "bold"
+                    else:
+                        emoji = ""
+                        name_color = "#333"
+                        name_weight = "normal"
+
+                    # Create compact row
+                    st.markdown(f"""
+                    <div style="
+                        display: flex; 
+                        justify-content: space-between; 
+                        align-items: center;
+                        padding: 8px 12px;
+                        margin: 4px 0;
+                        background-color: {'#FFF9E6' if is_first_place else '#FAFAFA'};
+                        border-left: 4px solid {'#FFD700' if is_first_place else '#E0E0E0'};
+                        border-radius: 4px;
+                    ">
+                        <div style="display: flex; align-items: center; flex: 1;">
+                            <span style="font-size: 16px; margin-right: 8px; width: 20px;">{emoji}</span>
+                            <span style="font-size: 16px; font-weight: bold; color: #666; margin-right: 12px; min-width: 30px;">{rank}</span>
+                            <span style="font-size: 18px; font-weight: {name_weight}; color: {name_color};">{salesrep}</span>
+                        </div>
+                        <div style="display: flex; align-items: center; gap: 20px;">
+                            <div style="text-align: center;">
+                                <span style="font-size: 18px; font-weight: bold; color: #2E8B57;">{customers}</span>
+                                <span style="font-size: 12px; color: #666; margin-left: 4px;">customers</span>
+                            </div>
+                            <div style="text-align: right; min-width: 60px;">
+                                <span style="font-size: 16px; font-weight: bold; color: #228B22;">{prize}</span>
+                            </div>
+                        </div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+            # Add spacing between leaderboard and customer details
+            st.markdown("<br><br>", unsafe_allow_html=True)
+            st.markdown("---")
+            st.markdown("<br>", unsafe_allow_html=True)
+
+        # --- CUSTOMER SEARCH ---
+        with trace.span("search"):
+            search_index = load_search_index(str(excel_path), data_version, model.contest_id)
+            customer_search(model.customers, search_index)
+
+        # --- TABBED DATA SECTION ---
+        with trace.span("tabs"):
+            customer_tabs(df_cleaned, df_pending, df_violations, model.outside)
+
+        # "Did my account count?" - the whole list, searchable and sortable in the browser
+        with trace.span("grid"):
+            customer_grid(model.customers)
+
+        with trace.span("history"):
+            # --- CHANGES TODAY ---
+            todays_changes = load_changes_since(datetime.now().strftime('%Y-%m-%d 00:00:00'), data_version)
+            if todays_changes:
+                with st.expander(f"🔄 Changes Today ({sum(len(entry['changes']) for entry in todays_changes)})", expanded=False):
+                    for entry in reversed(todays_changes):
+                        received = datetime.strptime(entry['received_time'], '%Y-%m-%d %H:%M:%S')
+                        st.markdown(f"**Report received {received.strftime('%I:%M %p')}**")
+                        for change in entry['changes']:
+                            st.markdown(f"• {describe(change)}")
+
+            # --- STANDINGS OVER TIME ---
+            # Daily series maintained by ingest (timeline.py) - nothing is recomputed here
+            standings_timeline = load_timeline(data_version)
+            if len(standings_timeline) > 0:
+                with st.expander("📈 Standings Over Time", expanded=False):
+                    metric = st.radio("Show", ["New Customers", "Rank"], horizontal=True, key="timeline_metric")
+                    chart_data = standings_timeline.pivot(index="Date", columns="Salesrep", values=metric)
+                    if metric == "Rank":
+                        # Rank 1 at the top
+                        chart_data = -chart_data
+                        st.caption("Higher is better - the line shows minus the rank")
+                    st.line_chart(chart_data)
+
+            # --- STANDINGS HISTORY ---
+            # Precomputed per report by the snapshot store, so browsing history costs one small read
+            snapshot_times, _ = read_snapshot_index()
+            if snapshot_times:
+                with st.expander("📜 Standings History", expanded=False):
+                    as_of = st.selectbox(
+                        "Standings as of report received",
+                        list(reversed(snapshot_times)),
+                        format_func=lambda t: t.strftime('%B %d, %Y at %I:%M %p'),
+                    )
+                    st.dataframe(standings_as_of(as_of), hide_index=True)
+
+    except FileNotFoundError:
+        st.error(f"File not found: {excel_path}")
+    except Exception as e:
+        st.error(f"An error occurred: {e}")
+    finally:
+        record(trace)
+
+live_results(contest['id'] if contest else None)
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def watch_version():
+    """Rerun the page when the data version changes - a tick is only the version check"""
+    # A manifest read, or the data source's rate-limited poll when VPSALES_DATA_URL is set
+    if current_data()[1] != st.session_state.get("data_version"):
+        # The whole page reruns: a fragment can only rerun itself from its own body
+        # (keyed reruns of another fragment need a widget callback), and making
+        # live_results the timed fragment would redraw it on every tick. New data
+        # arrives a few times a day and the header above is cheap (cached model,
+        # static logo), so one full rerun per new report costs less.
+        st.rerun()
+
+if REFRESH_SECONDS:
+    watch_version()
 
 # --- Close MAIN BLOCK ---
 st.markdown('</div>', unsafe_allow_html=True)
@@ -472,17 +554,40 @@ def show_winner_modal():
 
 # Show the modal when popup state is True
 if st.session_state.show_winner_popup:
+    # The standings are drawn inside the live_results fragment; the modal reads the shared model
+    popup_path, popup_version = current_data()
+    popup_model = load_model(str(popup_path), popup_version, contest['id'] if contest else None)
+    leaderboard, df_cleaned = popup_model.standings, popup_model.counted
     show_winner_modal()
 
+# --- PERFORMANCE PANEL ---
+# Only shown when VPSALES_ADMIN_KEY is set and the page is opened with ?admin=<that key>
+ADMIN_KEY = os.environ.get("VPSALES_ADMIN_KEY")
+if ADMIN_KEY and st.query_params.get("admin") == ADMIN_KEY:
+    with st.expander("⏱️ Performance (last runs in this process)", expanded=True):
+        for kind, title in [("model", "Model builds"), ("render", "Page runs")]:
+            runs = recent_runs(kind)
+            st.markdown(f"**{title}** ({len(runs)})")
+            if runs:
+                st.dataframe(pd.DataFrame(span_table(runs)), hide_index=True)
+        st.caption("Every trace is also appended to history/perf.jsonl - summarize it with python perf_trace.py")
+
 # --- TIMESTAMP ---
 central = ZoneInfo("America/Chicago")
-LAST_SYNC_TIMESTAMP = "2026-01-02 08:39:51"  # AUTO-UPDATED BY BATCH FILE
 
-# Display sync timestamp
-sync_time = datetime.strptime(LAST_SYNC_TIMESTAMP, '%Y-%m-%d %H:%M:%S')
-last_updated = sync_time.replace(tzinfo=central)
+@st.fragment(run_every=REFRESH_SECONDS)
+def sync_footer():
+    """Sync time - refreshed on the timer so a wall display shows the latest check, even with unchanged data"""
+    # Written by ingest into sync_metadata.json; re-read only when the file's mtime changes
+    LAST_SYNC_TIMESTAMP = read_sync_metadata(sync_metadata_path()).get("synced_at", "2026-01-02 08:39:51")
+
+    # Display sync timestamp
+    sync_time = datetime.strptime(LAST_SYNC_TIMESTAMP, '%Y-%m-%d %H:%M:%S')
+    last_updated = sync_time.replace(tzinfo=central)
+
+    st.markdown(
+        f"<div style='text-align: center; margin-top: 30px; color: gray; font-family: Futura, sans-serif;'>App last synced: {last_updated.strftime('%B %d, %Y at %I:%M %p')}</div>",
+        unsafe_allow_html=True
+    )
 
-st.markdown(
-    f"<div style='text-align: center; margin-top: 30px; color: gray; font-family: Futura, sans-serif;'>App last synced: {last_updated.strftime('%B %d, %Y at %I:%M %p')}</div>",
-    unsafe_allow_html=True
-)
+sync_footer()
\ No newline at end of file
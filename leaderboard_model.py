@@ -0,0 +1,349 @@
+"""
+Leaderboard Model
+The contest rules as plain pandas, with no Streamlit imports, so the app, the
+snapshot store and the command-line tools all compute standings the same way.
+Exclusions, violation keywords, prize tiers and the top prize come from a rules
+dict (a contest's "rules" in contests.json) compiled once per dataset.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+# Column names of the Van Paper export, in order
+EXPORT_COLUMNS = ["Customer Name", "Salesperson", "Prospect", "Last Invoice Date", "Customer Number"]
+
+STANDINGS_COLUMNS = ["Rank", "Salesrep", "Number of New Customers", "Prize"]
+
+# One row per customer across the three lists (grid view and search)
+CUSTOMER_TABLE_COLUMNS = ["Salesrep", "Customer", "Customer Number", "Invoice Date", "Status"]
+# "Outside window": invoiced, but not inside the contest window, so not counted
+CUSTOMER_STATUSES = ["Counted", "Pending", "Violation", "Outside window"]
+
+# Reason code for rows dropped as a fuzzy duplicate of another customer of the same rep
+DUPLICATE_NAME_REASON = "Duplicate name"
+
+# The original promo: $50 at 3+ new accounts, $100 split among the top rep(s)
+DEFAULT_RULES = {
+    # Customers of the same rep whose names match at least this well are one business
+    'fuzzy_threshold': 90,
+    # Reps dropped before counting: exact names, and names containing any of these
+    'exclude_salesreps': ["house account"],
+    'exclude_salesreps_containing': ["KCV"],
+    # Reps whose customers are listed but never counted toward standings
+    'uncounted_salesreps_containing': ["Van, Kyle"],
+    # Prospect column values that exclude a customer (keywords, case-insensitive);
+    # the first keyword found becomes the row's reason code
+    'violation_patterns': ["violation", "duplicate", "invalid", "exclude"],
+    'violation_ignore': ["Prospect"],
+    # Every rep reaching a tier gets that tier's prize (highest tier reached)
+    'tiers': [{'min_customers': 3, 'prize': 50}],
+    # Extra prize for the most new accounts; split evenly among ties when split_ties
+    'top_prize': {'amount': 100, 'split_ties': True},
+}
+
+
+def _contains_any(words, capture=False):
+    """Case-insensitive regex matching any of the literal words (None if there are none);
+    with capture=True the word found is group 1"""
+    if not words:
+        return None
+    pattern = "|".join(re.escape(word) for word in words)
+    return re.compile(f"({pattern})" if capture else f"(?:{pattern})", re.IGNORECASE)
+
+
+def compile_rules(rules=None):
+    """Merge a contest's rules over the defaults and precompile the patterns"""
+    if rules is not None and rules.get('compiled'):
+        return rules
+    merged = {**DEFAULT_RULES, **(rules or {})}
+    merged['top_prize'] = {**DEFAULT_RULES['top_prize'], **merged.get('top_prize', {})}
+    merged['tiers'] = sorted(merged['tiers'], key=lambda tier: tier['min_customers'])
+    merged['exclude_exact'] = {name.strip().lower() for name in merged['exclude_salesreps']}
+    merged['exclude_regex'] = _contains_any(merged['exclude_salesreps_containing'])
+    merged['uncounted_regex'] = _contains_any(merged['uncounted_salesreps_containing'])
+    merged['violation_regex'] = _contains_any(merged['violation_patterns'], capture=True)
+    merged['violation_reasons'] = {pattern.lower(): pattern.title() for pattern in merged['violation_patterns']}
+    merged['reason_categories'] = list(dict.fromkeys(
+        [*merged['violation_reasons'].values(), DUPLICATE_NAME_REASON]))
+    merged['violation_ignore_set'] = set(merged['violation_ignore'])
+    merged['compiled'] = True
+    return merged
+
+
+def prepare(df, rules=None):
+    """Rename the export columns, drop rows and reps that cannot count and flag
+    rule violations - every rule check runs once over whole columns"""
+    rules = compile_rules(rules)
+    df = df.copy()
+    df.columns = EXPORT_COLUMNS
+
+    # Rename to match our internal naming convention
+    df = df.rename(columns={
+        "Customer Name": "New Customer",
+        "Salesperson": "Salesrep",
+        "Customer Number": "Customer Number",
+        "Prospect": "Rule Violation"
+    })
+
+    df = df.dropna(subset=["New Customer", "Salesrep"])
+    if len(df) == 0:
+        return df
+
+    df = df[~df["Salesrep"].str.strip().str.lower().isin(rules['exclude_exact'])]
+
+    # Exclude reps by name fragment (e.g. initials KCV) from leaderboard eligibility
+    if rules['exclude_regex'] is not None:
+        df = df[~df["Salesrep"].str.contains(rules['exclude_regex'], na=False)]
+
+    df["Last Invoice Date"] = pd.to_datetime(df["Last Invoice Date"], errors="coerce")
+
+    # Convert Rule Violation to string and handle NaN values
+    df["Rule Violation"] = df["Rule Violation"].astype(str)
+    df["Rule Violation"] = df["Rule Violation"].replace("nan", "")
+
+    # Clean customer names
+    df["Cleaned Customer"] = df["New Customer"].str.lower()
+    df["Cleaned Customer"] = df["Cleaned Customer"].str.replace(r'[^\w\s]', '', regex=True)
+    df["Cleaned Customer"] = df["Cleaned Customer"].str.replace(r'\s+', ' ', regex=True).str.strip()
+
+    df["Violation Reason"] = violation_reasons(df["Rule Violation"], rules)
+    return df
+
+
+def violation_reasons(values, rules=None):
+    """Categorical reason code per row (missing = no violation) from one regex pass.
+
+    Real violations are specific text like "Duplicate", "Invalid", etc.;
+    "Prospect" values are valid customers.
+    """
+    rules = compile_rules(rules)
+    if rules['violation_regex'] is None or len(values) == 0:
+        reasons = pd.Series(np.nan, index=values.index, dtype=object)
+    else:
+        matched = values.str.extract(rules['violation_regex'], expand=False).str.lower()
+        reasons = matched.map(rules['violation_reasons']).where(~values.isin(rules['violation_ignore_set']))
+    return pd.Categorical(reasons, categories=rules['reason_categories'])
+
+
+def classify(df, rules=None, stats=None):
+    """Split prepared rows into (counted, pending, violations) DataFrames;
+    stats (a dict), when given, receives the number of fuzzy name comparisons"""
+    rules = compile_rules(rules)
+    threshold = rules['fuzzy_threshold']
+    comparisons = 0
+    kept_rows = []
+    pending_rows = []
+    violation_rows = []
+
+    # We'll iterate through all rows, grouping customers by fuzzy matches (token_set_ratio) >= 90
+    # ONLY within the same salesrep - duplicates are per-salesrep, not across all salesreps
+    for salesrep in df["Salesrep"].unique():
+        salesrep_df = df[df["Salesrep"] == salesrep].copy()
+        used_customers_for_rep = set()
+
+        for i, row in salesrep_df.iterrows():
+            cust_name = row["Cleaned Customer"]
+            if cust_name in used_customers_for_rep:
+                continue
+
+            # Find all rows for THIS salesrep with fuzzy token_set_ratio >= 90
+            comparisons += len(salesrep_df)
+            matches = salesrep_df[salesrep_df["Cleaned Customer"].apply(
+                lambda x: fuzz.token_set_ratio(x, cust_name) >= threshold)].copy()
+
+            # Mark all matched cleaned customers as used for this salesrep
+            used_customers_for_rep.update(matches["Cleaned Customer"].tolist())
+
+            # Check if any matches have rule violations (reason codes set once per row in prepare)
+            matches_with_violations = matches[matches["Violation Reason"].notna()]
+            if not matches_with_violations.empty:
+                # If there's a rule violation, add to violation list
+                best_violation = matches_with_violations.iloc[0]
+                violation_rows.append(best_violation)
+            else:
+                # If no explicit violations, process normally
+                # If any matched rows have an invoice date, pick the latest one for keeping
+                matches_with_invoice = matches[~matches["Last Invoice Date"].isna()]
+                if not matches_with_invoice.empty:
+                    best_match = matches_with_invoice.sort_values(by="Last Invoice Date", ascending=False).iloc[0]
+                    kept_rows.append(best_match)
+                else:
+                    # If none have invoice dates, just take the first match row
+                    best_match = matches.iloc[0]
+                    pending_rows.append(best_match)
+
+                # Add any remaining matches as duplicates/violations
+                remaining_matches = matches[matches.index != best_match.name]
+                for _, duplicate_row in remaining_matches.iterrows():
+                    duplicate_row["Violation Reason"] = DUPLICATE_NAME_REASON
+                    violation_rows.append(duplicate_row)
+
+    if stats is not None:
+        stats['fuzzy_comparisons'] = comparisons
+
+    df_cleaned = pd.DataFrame(kept_rows)
+    df_pending = pd.DataFrame(pending_rows)
+    df_violations = pd.DataFrame(violation_rows)
+    if len(df_violations) > 0:
+        df_violations["Violation Reason"] = pd.Categorical(df_violations["Violation Reason"],
+                                                           categories=rules['reason_categories'])
+
+    # Exclude reps such as "Van, Kyle C" (KCV) from leaderboard eligibility
+    if len(df_cleaned) > 0 and rules['uncounted_regex'] is not None:
+        df_cleaned = df_cleaned[~df_cleaned["Salesrep"].str.contains(rules['uncounted_regex'], na=False)]
+
+    return df_cleaned, df_pending, df_violations
+
+
+def format_prize(amount):
+    """$50, $100, $33.33 - no decimals for whole dollars"""
+    return f"${int(amount)}" if float(amount).is_integer() else f"${amount:.2f}"
+
+
+def rank_label(n):
+    """1 -> 1st, 2 -> 2nd, 11 -> 11th"""
+    suffixes = {1: "st", 2: "nd", 3: "rd"}
+    if 10 <= n % 100 <= 20:
+        return f"{n}th"
+    return f"{n}{suffixes.get(n % 10, 'th')}"
+
+
+def build_standings(counted, rules=None):
+    """Ranked leaderboard with prizes from the counted customers"""
+    if len(counted) == 0:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+    return standings_from_counts(counted.groupby("Salesrep")["New Customer"].nunique(), rules)
+
+
+def prize_amounts(counts, rules=None):
+    """Prize per rep for an array of new customer counts - whole-column NumPy, no row loop"""
+    rules = compile_rules(rules)
+    counts = np.asarray(counts)
+    prize = np.zeros(len(counts))
+    if len(counts) == 0:
+        return prize
+
+    # Highest tier reached (tiers are sorted by threshold)
+    for tier in rules['tiers']:
+        prize = np.where(counts >= tier['min_customers'], float(tier['prize']), prize)
+
+    top_prize = rules['top_prize']
+    if top_prize.get('amount'):
+        is_top = counts == counts.max()
+        # Prize per first place winner (split among ties)
+        share = top_prize['amount'] / is_top.sum() if top_prize.get('split_ties', True) else top_prize['amount']
+        prize = prize + np.where(is_top, share, 0.0)
+    return prize
+
+
+def standings_from_counts(counts, rules=None):
+    """Ranked leaderboard with prizes from a Series of salesrep -> new customer count"""
+    counts = counts[counts > 0]
+    if len(counts) == 0:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+
+    leaderboard = counts.rename_axis("Salesrep").rename("Number of New Customers").reset_index()
+    leaderboard = leaderboard.sort_values(by="Number of New Customers", ascending=False).reset_index(drop=True)
+
+    prizes = prize_amounts(leaderboard["Number of New Customers"].to_numpy(), rules)
+    leaderboard["Prize"] = [format_prize(amount) for amount in prizes]
+
+    # Create rank labels with ties
+    ranks_numeric = leaderboard["Number of New Customers"].rank(method='min', ascending=False).astype(int)
+    leaderboard.insert(0, "Rank", ranks_numeric.apply(rank_label))
+    return leaderboard
+
+
+def prize_descriptions(rules=None):
+    """(title, text) lines for the overview box, e.g. ('$50 Bonus', 'For every rep who ...')"""
+    rules = compile_rules(rules)
+    lines = [(f"{format_prize(tier['prize'])} Bonus",
+              f"For every rep who secures {tier['min_customers']}+ new accounts")
+             for tier in rules['tiers']]
+    if rules['top_prize'].get('amount'):
+        lines.append((f"{format_prize(rules['top_prize']['amount'])} Top Performer",
+                      "Additional prize for the rep with the most new accounts"))
+    return lines
+
+
+def compute(df, rules=None):
+    """Raw export -> {'counted', 'pending', 'violations', 'standings'}"""
+    rules = compile_rules(rules)
+    prepared = prepare(df, rules)
+    if len(prepared) == 0:
+        empty = pd.DataFrame()
+        return {'counted': empty, 'pending': empty, 'violations': empty,
+                'standings': build_standings(empty, rules)}
+    counted, pending, violations = classify(prepared, rules)
+    return {
+        'counted': counted,
+        'pending': pending,
+        'violations': violations,
+        'standings': build_standings(counted, rules),
+    }
+
+
+def customer_number_text(value):
+    """8317 / 8317.0 / "8317" -> "8317"; missing -> "" """
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def customer_table(counted, pending, violations, outside=None):
+    """Every customer with its status in one compact frame: text columns, ISO dates,
+    categorical rep and status (small to send and quick to filter)"""
+    frames = []
+    lists = (counted, pending, violations, outside if outside is not None else pd.DataFrame())
+    for status, df in zip(CUSTOMER_STATUSES, lists):
+        if len(df) == 0:
+            continue
+        invoice_dates = pd.to_datetime(df["Last Invoice Date"], errors="coerce")
+        frames.append(pd.DataFrame({
+            "Salesrep": df["Salesrep"].astype(str).to_numpy(),
+            "Customer": df["New Customer"].astype(str).to_numpy(),
+            "Customer Number": df["Customer Number"].map(customer_number_text).to_numpy(),
+            "Invoice Date": invoice_dates.dt.strftime("%Y-%m-%d").fillna("").to_numpy(),
+            "Status": status,
+        }))
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=CUSTOMER_TABLE_COLUMNS)
+    table["Salesrep"] = table["Salesrep"].astype("category")
+    table["Status"] = pd.Categorical(table["Status"], categories=CUSTOMER_STATUSES)
+    return table.sort_values(["Salesrep", "Customer"], ignore_index=True)
+
+
+class LeaderboardModel:
+    """Everything the page shows for one data version, computed once and then only read.
+
+    The app shares one instance between all sessions; attributes cannot be reassigned,
+    and pandas copy-on-write keeps a session that filters or sorts a frame from
+    changing what the others see.
+    """
+
+    __slots__ = ("version", "contest_id", "rows", "counted", "pending", "violations", "outside",
+                 "standings", "max_customers", "customers")
+
+    def __init__(self, version, counted, pending, violations, standings, rows, contest_id=None, outside=None):
+        outside = outside if outside is not None else pd.DataFrame()
+        values = {
+            'version': version,
+            'contest_id': contest_id,
+            'rows': rows,
+            'counted': counted,
+            'pending': pending,
+            'violations': violations,
+            'outside': outside,
+            'standings': standings,
+            'max_customers': standings["Number of New Customers"].max() if len(counted) and len(standings) else 0,
+            'customers': customer_table(counted, pending, violations, outside),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LeaderboardModel is read-only - build a new one for new data")
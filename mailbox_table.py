@@ -0,0 +1,309 @@
+"""
+Batched Outlook Metadata Fetch
+Reads ReceivedTime, Sender, Subject and attachment flags for many messages at once
+using Outlook's Table object instead of opening every MailItem over COM.
+Full message objects are only opened for the final candidates.
+"""
+
+from datetime import datetime, timedelta
+
+# Columns pulled for every message in a single GetArray call
+TABLE_COLUMNS = [
+    "EntryID",
+    "ReceivedTime",
+    "SenderEmailAddress",
+    "Subject",
+    "urn:schemas:httpmail:hasattachment",
+]
+
+# Rows requested per GetArray round-trip
+BATCH_SIZE = 100
+
+
+def build_received_filter(start_time=None, end_time=None):
+    """Build a Jet restriction on ReceivedTime for Folder.GetTable"""
+    clauses = []
+    if start_time is not None:
+        clauses.append(f"[ReceivedTime] >= '{start_time.strftime('%m/%d/%Y %I:%M %p')}'")
+    if end_time is not None:
+        clauses.append(f"[ReceivedTime] <= '{end_time.strftime('%m/%d/%Y %I:%M %p')}'")
+    return " AND ".join(clauses)
+
+
+def _naive(value):
+    """Drop tzinfo from COM datetimes so they compare with datetime.now()"""
+    if hasattr(value, 'replace') and getattr(value, 'tzinfo', None) is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+def fetch_message_rows(folder, start_time=None, end_time=None, limit=100):
+    """Fetch metadata rows for up to `limit` messages in one batched table query"""
+    table = folder.GetTable(build_received_filter(start_time, end_time), 0)
+    table.Columns.RemoveAll()
+    for column in TABLE_COLUMNS:
+        table.Columns.Add(column)
+    table.Sort("[ReceivedTime]", True)
+
+    rows = []
+    while len(rows) < limit:
+        batch = table.GetArray(min(BATCH_SIZE, limit - len(rows)))
+        if not batch:
+            break
+        for entry_id, received, sender, subject, has_attachments in batch:
+            if not received:
+                continue
+            received = _naive(received)
+            # Restriction is applied server-side; re-check in case the store ignores it
+            if start_time is not None and received < start_time:
+                continue
+            if end_time is not None and received > end_time:
+                continue
+            rows.append({
+                'entry_id': entry_id,
+                'received_time': received,
+                'sender': str(sender or ''),
+                'subject': str(subject or ''),
+                'has_attachments': bool(has_attachments),
+            })
+        if len(batch) < BATCH_SIZE:
+            break
+
+    return rows[:limit]
+
+
+def is_vanpaper_row(row, sender='noreply@vanpaper.com', subject='leaderboardexport'):
+    """Check whether a metadata row looks like a Van Paper leaderboard report"""
+    return (sender in row['sender'].lower() and
+            subject in row['subject'].lower() and
+            row['has_attachments'])
+
+
+def open_message(namespace, row):
+    """Open the full MailItem for a metadata row"""
+    return namespace.GetItemFromID(row['entry_id'])
+
+
+# --- FAKE BACKEND (for measuring round-trips without Outlook) ---
+
+class RoundTripCounter:
+    """Counts simulated cross-process COM calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def hit(self, n=1):
+        self.calls += n
+
+
+class FakeAttachment:
+    def __init__(self, counter, filename):
+        self._counter = counter
+        self._filename = filename
+
+    @property
+    def FileName(self):
+        self._counter.hit()
+        return self._filename
+
+
+class FakeAttachments:
+    def __init__(self, counter, filenames):
+        self._counter = counter
+        self._items = [FakeAttachment(counter, name) for name in filenames]
+
+    @property
+    def Count(self):
+        self._counter.hit()
+        return len(self._items)
+
+    def __iter__(self):
+        for item in self._items:
+            self._counter.hit()
+            yield item
+
+    def __getitem__(self, index):
+        self._counter.hit()
+        return self._items[index]
+
+
+class FakeMessage:
+    """MailItem stand-in where every property read is one round-trip"""
+
+    def __init__(self, counter, entry_id, received_time, sender, subject, attachments=()):
+        self._counter = counter
+        self._data = {
+            'EntryID': entry_id,
+            'ReceivedTime': received_time,
+            'SenderEmailAddress': sender,
+            'Subject': subject,
+        }
+        self._attachments = FakeAttachments(counter, list(attachments))
+
+    def __getattr__(self, name):
+        data = self.__dict__.get('_data', {})
+        if name in data:
+            self._counter.hit()
+            return data[name]
+        raise AttributeError(name)
+
+    @property
+    def Attachments(self):
+        self._counter.hit()
+        return self._attachments
+
+
+class FakeItems:
+    def __init__(self, counter, messages):
+        self._counter = counter
+        self._messages = list(messages)
+
+    def Sort(self, prop, descending=False):
+        self._counter.hit()
+        self._messages.sort(key=lambda m: m._data['ReceivedTime'], reverse=descending)
+
+    def __iter__(self):
+        for message in self._messages:
+            self._counter.hit()
+            yield message
+
+
+class FakeColumns:
+    def __init__(self, counter):
+        self._counter = counter
+        self.names = []
+
+    def RemoveAll(self):
+        self._counter.hit()
+        self.names = []
+
+    def Add(self, name):
+        self._counter.hit()
+        self.names.append(name)
+
+
+class FakeTable:
+    """Table stand-in: each GetArray call is one round-trip for the whole batch"""
+
+    def __init__(self, counter, messages):
+        self._counter = counter
+        self._messages = list(messages)
+        self._position = 0
+        self.Columns = FakeColumns(counter)
+
+    def Sort(self, prop, descending=False):
+        self._counter.hit()
+        self._messages.sort(key=lambda m: m._data['ReceivedTime'], reverse=descending)
+
+    def GetArray(self, max_rows):
+        self._counter.hit()
+        chunk = self._messages[self._position:self._position + max_rows]
+        self._position += len(chunk)
+        rows = []
+        for message in chunk:
+            row = []
+            for name in self.Columns.names:
+                if name == "urn:schemas:httpmail:hasattachment":
+                    row.append(bool(message._attachments._items))
+                else:
+                    row.append(message._data.get(name))
+            rows.append(tuple(row))
+        return tuple(rows)
+
+
+class FakeFolder:
+    def __init__(self, counter, messages):
+        self._counter = counter
+        self._messages = list(messages)
+
+    @property
+    def Items(self):
+        self._counter.hit()
+        return FakeItems(self._counter, self._messages)
+
+    def GetTable(self, restriction="", table_contents=0):
+        self._counter.hit()
+        return FakeTable(self._counter, self._messages)
+
+
+class FakeNamespace:
+    """MAPI namespace stand-in with a shared round-trip counter"""
+
+    def __init__(self, folders):
+        self.counter = RoundTripCounter()
+        self._folders = {}
+        self._by_id = {}
+        for folder_id, specs in folders.items():
+            messages = [FakeMessage(self.counter, **spec) for spec in specs]
+            self._folders[folder_id] = FakeFolder(self.counter, messages)
+            for message in messages:
+                self._by_id[message._data['EntryID']] = message
+
+    @property
+    def round_trips(self):
+        return self.counter.calls
+
+    def GetDefaultFolder(self, folder_id):
+        self.counter.hit()
+        return self._folders[folder_id]
+
+    def GetItemFromID(self, entry_id):
+        self.counter.hit()
+        return self._by_id[entry_id]
+
+
+def build_fake_mailbox(folder_ids=(6, 5, 3, 23, 4, 16), per_folder=100, now=None):
+    """Build a fake mailbox with one Van Paper report in the Inbox"""
+    now = now or datetime.now()
+    folders = {}
+    for folder_id in folder_ids:
+        specs = []
+        for i in range(per_folder):
+            specs.append({
+                'entry_id': f"{folder_id}-{i}",
+                'received_time': now - timedelta(minutes=5 * i),
+                'sender': 'someone@example.com',
+                'subject': f'Message {i}',
+            })
+        folders[folder_id] = specs
+    folders[folder_ids[0]][3] = {
+        'entry_id': f"{folder_ids[0]}-3",
+        'received_time': now - timedelta(minutes=15),
+        'sender': 'noreply@vanpaper.com',
+        'subject': 'Inform Auto Scheduled Report: leaderboardexport',
+        'attachments': ['leaderboardexport.xlsx'],
+    }
+    return folders
+
+
+def compare_round_trips(per_folder=100):
+    """Compare per-item property reads against the batched table fetch"""
+    folders = build_fake_mailbox(per_folder=per_folder)
+
+    per_item = FakeNamespace(folders)
+    for folder_id in folders:
+        messages = per_item.GetDefaultFolder(folder_id).Items
+        messages.Sort("[ReceivedTime]", True)
+        for message in messages:
+            _ = message.ReceivedTime
+            sender = message.SenderEmailAddress
+            subject = message.Subject
+            if message.Attachments.Count > 0 and 'vanpaper' in sender:
+                _ = subject
+
+    batched = FakeNamespace(folders)
+    for folder_id in folders:
+        rows = fetch_message_rows(batched.GetDefaultFolder(folder_id), limit=per_folder)
+        for row in rows:
+            if is_vanpaper_row(row):
+                message = open_message(batched, row)
+                _ = [att.FileName for att in message.Attachments]
+
+    return per_item.round_trips, batched.round_trips
+
+
+if __name__ == "__main__":
+    per_item_calls, batched_calls = compare_round_trips()
+    print("📊 Round-trips for 6 folders x 100 messages")
+    print(f"   Per-item reads: {per_item_calls}")
+    print(f"   Batched table:  {batched_calls}")
@@ -12,11 +12,12 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='ascii', errors='replace')
 
 import win32com.client
-import pandas as pd
-import os
-from datetime import datetime, timedelta
-import subprocess
-import shutil
+from datetime import datetime
+
+from run_lock import run_exclusive
+from ingest import ingest_report, update_live_app
+from report_store import save_report
+from sync_metadata import record_sync
 
 def update_from_latest_vanpaper():
     """Find and process the most recent Van Paper email"""
@@ -76,27 +77,11 @@ def update_from_latest_vanpaper():
             with open("last_sync.txt", "w") as f:
                 f.write(current_timestamp)
             
-            # Update timestamp in leaderboard.py even when no new emails
+            # Record the check in the sync sidecar - app code and data stay untouched, and
+            # a sync time on its own is not worth a commit
             try:
-                with open("leaderboard.py", "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                import re
-                pattern = r'LAST_SYNC_TIMESTAMP = "[^"]*"'
-                replacement = f'LAST_SYNC_TIMESTAMP = "{current_timestamp}"'
-                
-                if re.search(pattern, content):
-                    content = re.sub(pattern, replacement, content)
-                    
-                    with open("leaderboard.py", "w", encoding="utf-8") as f:
-                        f.write(content)
-                    print(f"[OK] Updated embedded timestamp: {current_timestamp}")
-                    
-                    # Commit the timestamp update
-                    subprocess.run(["git", "add", "leaderboard.py"], capture_output=True)
-                    subprocess.run(["git", "commit", "-m", f"Update sync timestamp - no new emails found"], capture_output=True)
-                    subprocess.run(["git", "push"], capture_output=True)
-                    print("[OK] Pushed timestamp update to live app")
+                record_sync()
+                print(f"[OK] Updated sync metadata: {current_timestamp}")
                     
             except Exception as e:
                 print(f"[WARNING] Timestamp update failed: {e}")
@@ -108,88 +93,36 @@ def update_from_latest_vanpaper():
         filename = attachment.FileName
         print(f"Processing: {filename}")
         
-        # Save attachment
-        temp_path = os.path.join(os.getcwd(), f"temp_{filename}")
-        attachment.SaveAsFile(temp_path)
-        
-        # Backup current file
-        current_file = "leaderboard_new.xlsx"
-        backup_name = f"leaderboard_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        if os.path.exists(current_file):
-            shutil.copy2(current_file, backup_name)
-            print(f"Created backup: {backup_name}")
-        
-        # Update main file
-        shutil.copy2(temp_path, current_file)
-        print(f"Updated {current_file}")
-        
-        # Save timestamped copy
-        timestamped_name = f"leaderboard_from_vanpaper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        shutil.copy2(temp_path, timestamped_name)
+        # Save attachment once, into the report store
+        snapshot = save_report(lambda path: attachment.SaveAsFile(str(path)), latest_vanpaper.ReceivedTime)
+        print(f"Stored: reports/{snapshot.name}")
         
-        # Clean up
-        os.remove(temp_path)
+        # Verify it, link leaderboard_new.xlsx to it (swapped in atomically) and
+        # record the sync with its row counts
+        result = ingest_report(snapshot, latest_vanpaper.ReceivedTime)
+        print(f"Data verified: {result['rows']} rows loaded")
+        if result['unchanged']:
+            print(f"No rows changed - leaderboard_new.xlsx left as is")
+        else:
+            print(f"Updated leaderboard_new.xlsx (version {result['version']})")
         
-        # Verify data
-        try:
-            df = pd.read_excel(current_file)
-            print(f"Data verified: {len(df)} rows loaded")
-            if len(df) > 0:
-                print(f"Sample customers: {', '.join(df.iloc[:3, 0].astype(str).tolist())}")
-        except Exception as e:
-            print(f"Data verification failed: {e}")
-        
-        # Create sync timestamp file and update embedded timestamp BEFORE git
+        # Sync timestamp file BEFORE git
         current_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         with open("last_sync.txt", "w") as f:
             f.write(current_timestamp)
-        
-        # Update timestamp directly in leaderboard.py for reliability
-        try:
-            with open("leaderboard.py", "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # Find and replace the timestamp line
-            import re
-            pattern = r'LAST_SYNC_TIMESTAMP = "[^"]*"'
-            replacement = f'LAST_SYNC_TIMESTAMP = "{current_timestamp}"'
-            
-            if re.search(pattern, content):
-                content = re.sub(pattern, replacement, content)
-                
-                with open("leaderboard.py", "w", encoding="utf-8") as f:
-                    f.write(content)
-                print(f"[OK] Updated embedded timestamp: {current_timestamp}")
-            else:
-                print("[WARNING] Could not find timestamp in leaderboard.py")
-                
-        except Exception as e:
-            print(f"[WARNING] Timestamp update failed: {e}")
 
         # Git update
         print("Updating live Streamlit app...")
-        git_commands = [
-            ["git", "add", "."],
-            ["git", "commit", "-m", f"One-click update from Van Paper {latest_vanpaper.ReceivedTime.strftime('%I:%M %p')} on {latest_vanpaper.ReceivedTime.strftime('%Y-%m-%d')}"],
-            ["git", "push"]
-        ]
-        
-        for cmd in git_commands:
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
-                if result.returncode == 0:
-                    print(f"[OK] {' '.join(cmd[:2])}")
-                else:
-                    print(f"[ERROR] {' '.join(cmd[:2])}: {result.stderr}")
-            except Exception as e:
-                print(f"Git error: {e}")
+        if update_live_app(latest_vanpaper.ReceivedTime):
+            print("[OK] Pushed to live app")
+        else:
+            print("[ERROR] Git update failed - see the warning above")
         
         print()
         print("=== UPDATE COMPLETE! ===")
         print(f"[OK] Processed Van Paper email from {latest_vanpaper.ReceivedTime.strftime('%I:%M %p')}")
         print(f"[OK] Live app updated: https://vpsales.streamlit.app/")
-        print(f"[OK] {len(df)} customers loaded")
+        print(f"[OK] {result['rows']} customers loaded")
         print()
         
         return True
@@ -202,9 +135,12 @@ def update_from_latest_vanpaper():
         return False
 
 if __name__ == "__main__":
-    success = update_from_latest_vanpaper()
+    # Wait for any scheduled run to finish instead of racing it on git
+    ran, success = run_exclusive("one_click_update", lambda triggers: update_from_latest_vanpaper(), wait=True)
     # Silent mode - no user input required
-    if success:
+    if not ran:
+        print("Another automation run handled this update")
+    elif success:
         print("Update completed successfully!")
     else:
         print("Update failed - check logs")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Performance Traces
+Lightweight timing spans for the leaderboard. Every model build and every page run
+records how long each stage took (read, cleaning, dedupe, ranking, rendering) with
+row counts and the number of fuzzy name comparisons. The last RECENT_RUNS traces
+of each kind stay in memory for the app's hidden admin panel (?admin=<key>), and each
+trace is also appended as one JSON line to history/perf.jsonl for offline analysis
+(rotated to perf.jsonl.1 at 5 MB).
+
+Set VPSALES_PERF_LOG to log somewhere else, or to "off" to keep traces in memory only.
+
+Usage:
+    python perf_trace.py                # per-stage timings from the log
+    python perf_trace.py --last 20      # only the last 20 traces
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent
+PERF_LOG = os.environ.get("VPSALES_PERF_LOG", str(APP_DIR / "history" / "perf.jsonl"))
+
+# Traces of each kind kept in memory for the admin panel
+RECENT_RUNS = 50
+# The log is moved to perf.jsonl.1 (replacing the previous one) when it reaches this size
+PERF_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+_lock = threading.Lock()
+# One deque per kind, so frequent page runs never push out the rarer model builds
+_recent = {}
+
+
+class Trace:
+    """The spans of one run; record() it when the run is done"""
+
+    def __init__(self, kind, **fields):
+        self.kind = kind
+        self.fields = fields
+        self.spans = []
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, **counts):
+        """Time a block. Counts can be passed in or set on the yielded dict inside the block."""
+        entry = {'name': name, **counts}
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['ms'] = round((time.perf_counter() - started) * 1000, 2)
+            self.spans.append(entry)
+
+    def as_dict(self):
+        return {
+            'time': self.started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'kind': self.kind,
+            **self.fields,
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 2),
+            'spans': self.spans,
+        }
+
+
+def record(trace, log_path=None):
+    """Keep a finished trace for the admin panel and append it to the JSON log"""
+    entry = trace.as_dict()
+    log_path = PERF_LOG if log_path is None else log_path
+    with _lock:
+        _recent.setdefault(trace.kind, deque(maxlen=RECENT_RUNS)).append(entry)
+        if str(log_path).lower() != "off":
+            try:
+                log_path = Path(log_path)
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                if log_path.exists() and log_path.stat().st_size >= PERF_LOG_MAX_BYTES:
+                    os.replace(log_path, log_path.with_name(log_path.name + ".1"))
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            except OSError:
+                pass
+    return entry
+
+
+def recent_runs(kind=None):
+    """Traces recorded by this process, newest first"""
+    with _lock:
+        entries = [entry for recent_kind, recent in _recent.items() if kind in (None, recent_kind)
+                   for entry in reversed(recent)]
+    return sorted(entries, key=lambda entry: entry['time'], reverse=True)
+
+
+def span_table(entries):
+    """One row per trace: time, kind, total and each span's ms, plus the row/comparison counts"""
+    rows = []
+    for entry in entries:
+        row = {'time': entry['time'], 'kind': entry['kind'], 'total ms': entry['total_ms']}
+        row.update({key: value for key, value in entry.items()
+                    if key not in ('time', 'kind', 'total_ms', 'spans')})
+        for span in entry['spans']:
+            row[f"{span['name']} ms"] = span['ms']
+            row.update({f"{span['name']} {key}": value for key, value in span.items() if key not in ('name', 'ms')})
+        rows.append(row)
+    return rows
+
+
+def read_log(log_path=None, last=None):
+    """Traces from the JSON log, oldest first"""
+    log_path = Path(PERF_LOG if log_path is None else log_path)
+    if not log_path.exists():
+        return []
+    with open(log_path, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return entries[-last:] if last else entries
+
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Summarize the leaderboard performance log")
+    parser.add_argument('--last', type=int, help="only the last N traces")
+    args = parser.parse_args()
+
+    entries = read_log(last=args.last)
+    if not entries:
+        print(f"❌ No traces in {PERF_LOG}")
+    else:
+        spans = pd.DataFrame([{'kind': entry['kind'], 'stage': span['name'], 'ms': span['ms']}
+                              for entry in entries for span in entry['spans']])
+        summary = spans.groupby(['kind', 'stage'], sort=False)['ms'].describe(percentiles=[0.5, 0.95])
+        print(f"⏱️ {len(entries)} traces from {PERF_LOG}")
+        print(summary[['count', 'mean', '50%', '95%', 'max']].round(1).to_string())
@@ -3,11 +3,10 @@ Process 9:07 AM Van Paper Email
 """
 
 import win32com.client
-import pandas as pd
-import os
 from datetime import datetime, timedelta
-import subprocess
-import shutil
+
+from ingest import ingest_report, update_live_app
+from report_store import save_report
 
 def process_907_email():
     try:
@@ -58,49 +57,21 @@ def process_907_email():
         filename = attachment.FileName
         print(f"Processing: {filename}")
         
-        # Save attachment
-        temp_path = os.path.join(os.getcwd(), f"temp_{filename}")
-        attachment.SaveAsFile(temp_path)
-        
-        # Backup current file
-        current_file = "leaderboard_new.xlsx"
-        backup_name = f"leaderboard_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        
-        if os.path.exists(current_file):
-            shutil.copy2(current_file, backup_name)
-            print(f"Created backup: {backup_name}")
-        
-        # Update main file
-        shutil.copy2(temp_path, current_file)
-        print(f"Updated {current_file}")
-        
-        # Save timestamped copy
-        timestamped_name = f"leaderboard_from_vanpaper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-        shutil.copy2(temp_path, timestamped_name)
-        
-        # Clean up
-        os.remove(temp_path)
-        
-        # Verify data
-        try:
-            df = pd.read_excel(current_file)
-            print(f"Data verified: {len(df)} rows loaded")
-        except Exception as e:
-            print(f"Data verification failed: {e}")
-        
-        # Git update
-        git_commands = [
-            ["git", "add", "."],
-            ["git", "commit", "-m", f"MANUAL: Process 9:07 AM Van Paper email from {target_email.ReceivedTime.strftime('%Y-%m-%d')}"],
-            ["git", "push"]
-        ]
-        
-        for cmd in git_commands:
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
-                print(f"{' '.join(cmd)}: {result.returncode}")
-            except Exception as e:
-                print(f"Git error: {e}")
+        # Save the attachment once, into the report store, and publish it - the live
+        # file becomes a hard link to the stored report and is never written in place
+        snapshot = save_report(lambda path: attachment.SaveAsFile(str(path)), target_email.ReceivedTime)
+        print(f"Stored as reports/{snapshot.name}")
+        result = ingest_report(snapshot, target_email.ReceivedTime)
+        print(f"Data verified: {result['rows']} rows loaded")
+        if result['unchanged']:
+            print(f"No rows changed - live data kept (version {result['version']})")
+        else:
+            print(f"Updated leaderboard_new.xlsx (version {result['version']})")
+        
+        # Git update - commits and pushes the published files
+        print("Updating Git Repository...")
+        if not update_live_app(target_email.ReceivedTime):
+            print("Git update failed - see the warning above")
         
         print("Successfully processed 9:07 AM email!")
         return True
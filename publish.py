@@ -0,0 +1,118 @@
+"""
+Atomic Leaderboard Publish
+Moves a fully written report over leaderboard_new.xlsx with a single os.replace,
+so the Streamlit app never sees a missing or half-written file.
+leaderboard_manifest.json records which snapshot is live and its version number.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent
+MAIN_LEADERBOARD = APP_DIR / "leaderboard_new.xlsx"
+MANIFEST_FILE = APP_DIR / "leaderboard_manifest.json"
+
+# What an ingest commit stages: text files only, never the binary workbook
+PUBLISHED_FILES = ["leaderboard_new.csv", "leaderboard_manifest.json", "sync_metadata.json", "daily_counts.json",
+                   "leaderboard.html"]
+# Published files whose sync time moves on every check, even when no data changed
+SYNC_TIME_FILES = ["sync_metadata.json", "leaderboard.html"]
+
+
+def _fsync_file(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def _fsync_dir(path):
+    """Flush the directory entry after a rename (not supported on Windows)"""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def staging_path(live_path=MAIN_LEADERBOARD):
+    """Temporary path next to the live file (same directory, so os.replace is a rename)"""
+    live_path = Path(live_path)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    return live_path.with_name(f".{live_path.stem}.{timestamp}.tmp{live_path.suffix}")
+
+
+def read_json(path, default=None):
+    """Load a JSON file, returning default if it is missing or unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {} if default is None else default
+
+
+def read_manifest(manifest_path=MANIFEST_FILE):
+    """Return the current manifest, or an empty version-0 manifest"""
+    return read_json(manifest_path, {'version': 0})
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file, fsync it and rename it into place"""
+    path = Path(path)
+    temp_path = staging_path(path)
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    _fsync_dir(path.parent)
+
+
+def atomic_publish(staged_path, live_path=MAIN_LEADERBOARD, received_time=None, snapshot=None,
+                   manifest_path=MANIFEST_FILE, extra=None):
+    """Rename a fully written file over the live file and bump the manifest version"""
+    staged_path = Path(staged_path)
+    live_path = Path(live_path)
+    if staged_path.resolve().parent != live_path.resolve().parent:
+        raise ValueError(f"{staged_path} must be in the same directory as {live_path}")
+
+    _fsync_file(staged_path)
+    sha256 = file_sha256(staged_path)
+    os.replace(staged_path, live_path)
+    _fsync_dir(live_path.parent)
+
+    previous = read_manifest(manifest_path)
+    manifest = {
+        'version': previous.get('version', 0) + 1,
+        'file': live_path.name,
+        'snapshot': snapshot or live_path.name,
+        'sha256': sha256,
+        'received_time': received_time.strftime('%Y-%m-%d %H:%M:%S') if received_time else None,
+        'published_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    manifest.update(extra or {})
+    write_json_atomic(manifest_path, manifest)
+    return manifest
+
+
+def publish_copy(source_path, live_path=MAIN_LEADERBOARD, received_time=None, snapshot=None, extra=None):
+    """Publish a file that lives elsewhere: copy it next to the live file, then rename"""
+    staged = staging_path(live_path)
+    try:
+        shutil.copy2(source_path, staged)
+        return atomic_publish(staged, live_path, received_time=received_time, snapshot=snapshot, extra=extra)
+    finally:
+        if staged.exists():
+            staged.unlink()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Report Diff
+Compares two Van Paper exports row by row, keyed on Customer Number + Salesperson,
+and keeps the result as a compact change log (history/changes.jsonl).
+Publishing uses it to skip reports that change nothing, and the app uses the log
+for a "what changed since this morning" view without computing two leaderboards.
+
+Usage:
+    python report_diff.py compare old.xlsx new.xlsx
+    python report_diff.py since "2025-10-15 08:00"
+"""
+
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from canonical_export import EXPORT_COLUMNS, canonicalize, read_export
+
+APP_DIR = Path(__file__).parent
+CHANGE_LOG = APP_DIR / "history" / "changes.jsonl"
+
+KEY_COLUMNS = ["Customer Number", "Salesperson"]
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _keyed(df):
+    """Canonical text rows indexed by (customer number, salesperson, occurrence)"""
+    rows = df.iloc[:, :len(EXPORT_COLUMNS)].copy()
+    rows.columns = EXPORT_COLUMNS
+    rows = canonicalize(rows)
+    # The same customer can appear twice for one rep; number the repeats so keys stay unique
+    rows["Occurrence"] = rows.groupby(KEY_COLUMNS).cumcount()
+    return rows.set_index(KEY_COLUMNS + ["Occurrence"])
+
+
+def _change(kind, key, row, fields=None):
+    change = {
+        'change': kind,
+        'customer_number': key[0],
+        'salesrep': key[1],
+        'customer': row["Customer Name"],
+    }
+    if fields:
+        change['fields'] = fields
+        # No invoice -> invoice is what moves a customer from pending to counted
+        if "Last Invoice Date" in fields and fields["Last Invoice Date"][0] == "":
+            change['invoiced'] = True
+    return change
+
+
+def diff_exports(old_df, new_df):
+    """List of added / removed / changed rows between two exports (empty if identical)"""
+    old_rows, new_rows = _keyed(old_df), _keyed(new_df)
+
+    changes = []
+    for key in new_rows.index.difference(old_rows.index):
+        changes.append(_change('added', key, new_rows.loc[key]))
+    for key in old_rows.index.difference(new_rows.index):
+        changes.append(_change('removed', key, old_rows.loc[key]))
+
+    common = new_rows.index.intersection(old_rows.index)
+    before, after = old_rows.loc[common], new_rows.loc[common]
+    differs = before.ne(after)
+    for key in common[differs.any(axis=1).to_numpy()]:
+        columns = differs.columns[differs.loc[key].to_numpy()]
+        fields = {column: [before.at[key, column], after.at[key, column]] for column in columns}
+        changes.append(_change('changed', key, after.loc[key], fields))
+
+    return changes
+
+
+def summarize(changes):
+    """{'added': n, 'removed': n, 'changed': n, 'invoiced': n}"""
+    summary = {'added': 0, 'removed': 0, 'changed': 0, 'invoiced': 0}
+    for change in changes:
+        summary[change['change']] += 1
+        if change.get('invoiced'):
+            summary['invoiced'] += 1
+    return summary
+
+
+def record_changes(changes, received_time, previous_sha256=None, sha256=None, log_path=CHANGE_LOG):
+    """Append one line for a published report to the change log"""
+    entry = {
+        'received_time': datetime(received_time.year, received_time.month, received_time.day,
+                                  received_time.hour, received_time.minute,
+                                  received_time.second).strftime(TIME_FORMAT),
+        'previous_sha256': previous_sha256,
+        'sha256': sha256,
+        **summarize(changes),
+        'changes': changes,
+    }
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def changes_since(since, log_path=CHANGE_LOG):
+    """Change log entries for reports received after `since`, oldest first"""
+    since = since.strftime(TIME_FORMAT)
+    entries = []
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if entry['received_time'] > since:
+                        entries.append(entry)
+    except FileNotFoundError:
+        return []
+    return sorted(entries, key=lambda entry: entry['received_time'])
+
+
+def describe(change):
+    """One readable line for a change"""
+    who = f"{change['customer']} ({change['customer_number'] or 'N/A'}) - {change['salesrep']}"
+    if change['change'] == 'added':
+        return f"➕ {who}"
+    if change['change'] == 'removed':
+        return f"➖ {who}"
+    if change.get('invoiced'):
+        return f"🧾 {who}: first invoice {change['fields']['Last Invoice Date'][1]}"
+    fields = ", ".join(f"{column} {old or '-'} → {new or '-'}"
+                       for column, (old, new) in change['fields'].items())
+    return f"✏️ {who}: {fields}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Row-level changes between Van Paper exports")
+    commands = parser.add_subparsers(dest="command", required=True)
+    compare = commands.add_parser("compare", help="diff two export files (xlsx or canonical csv)")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    since = commands.add_parser("since", help="logged changes since a time")
+    since.add_argument("when", help="'YYYY-mm-dd HH:MM' (or just a date)")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        changes = diff_exports(read_export(args.old), read_export(args.new))
+        for change in changes:
+            print(describe(change))
+        print(f"📊 {summarize(changes)}")
+    else:
+        entries = changes_since(pd.Timestamp(args.when).to_pydatetime())
+        for entry in entries:
+            print(f"📧 {entry['received_time']}: +{entry['added']} -{entry['removed']} ~{entry['changed']}")
+            for change in entry['changes']:
+                print(f"   {describe(change)}")
+        if not entries:
+            print("✅ No changes logged since then")
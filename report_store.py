@@ -0,0 +1,155 @@
+"""
+Versioned Report Store
+Each Van Paper attachment is written exactly once, into reports/.
+leaderboard_new.xlsx becomes a hard link to that stored file (swapped in atomically),
+and reports/index.json is the history - no backup or timestamped copies.
+Each published report is also appended to the snapshot store for as-of queries,
+and reports identical to the live data are not republished.
+Every publish also regenerates the static leaderboard.html.
+"""
+
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from canonical_export import CANONICAL_FILE, load_canonical, write_canonical
+from contests import DAILY_COUNTS_FILE, write_daily_counts
+from publish import (MAIN_LEADERBOARD, atomic_publish, file_sha256, publish_copy,
+                     read_json, read_manifest, staging_path, write_json_atomic)
+from report_diff import diff_exports, record_changes
+from snapshot_store import append_snapshot
+from static_export import STATIC_HTML_FILE, write_static_html
+from timeline import update_timeline
+
+APP_DIR = Path(__file__).parent
+STORE_DIR = APP_DIR / "reports"
+INDEX_FILE = STORE_DIR / "index.json"
+
+
+def read_index():
+    """Return the list of stored snapshots, oldest first"""
+    return read_json(INDEX_FILE).get('snapshots', [])
+
+
+def _snapshot_path(received_time):
+    """reports/vanpaper_<received>.xlsx, suffixed if that name is already taken"""
+    base = f"vanpaper_{received_time.strftime('%Y%m%d_%H%M%S')}"
+    path = STORE_DIR / f"{base}.xlsx"
+    n = 1
+    while path.exists():
+        path = STORE_DIR / f"{base}_{n}.xlsx"
+        n += 1
+    return path
+
+
+def save_report(save_as, received_time):
+    """Write a report into the store once. save_as(path) does the actual write
+    (e.g. Attachment.SaveAsFile); the file is renamed into place when complete."""
+    STORE_DIR.mkdir(exist_ok=True)
+    snapshot = _snapshot_path(received_time)
+    temp_path = staging_path(snapshot)
+    try:
+        save_as(temp_path)
+        os.replace(temp_path, snapshot)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    entries = read_index()
+    entries.append({
+        'snapshot': snapshot.name,
+        'received_time': received_time.strftime('%Y-%m-%d %H:%M:%S'),
+        'stored_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'sha256': file_sha256(snapshot),
+    })
+    write_json_atomic(INDEX_FILE, {'snapshots': entries})
+    return snapshot
+
+
+def import_file(source_path, received_time=None):
+    """Copy an existing file (e.g. a manual download) into the store"""
+    source_path = Path(source_path)
+    if received_time is None:
+        received_time = datetime.fromtimestamp(source_path.stat().st_mtime)
+    return save_report(lambda target: shutil.copy2(source_path, target), received_time)
+
+
+def _write_static_page():
+    """Regenerate leaderboard.html from the live data; the sync time is this run's,
+    which the caller's record_sync() stamps right after publishing"""
+    try:
+        write_static_html(synced_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    except Exception as e:
+        print(f"⚠️ Static leaderboard.html not updated: {e}")
+
+
+def publish_report(snapshot, received_time=None, live_path=MAIN_LEADERBOARD, force=False):
+    """Point the live file at a stored snapshot: hard link + atomic rename, no data copy.
+    The canonical CSV that gets committed instead of the workbook (and the per-day
+    contest counts) are written first.
+
+    The report is diffed against the live data first; when no row changed, nothing is
+    republished and the current manifest comes back with 'unchanged': True.
+    """
+    snapshot = Path(snapshot)
+    snapshot_name = f"{STORE_DIR.name}/{snapshot.name}"
+    df = pd.read_excel(snapshot)
+
+    previous_manifest = read_manifest()
+    changes = None
+    if CANONICAL_FILE.exists():
+        changes = diff_exports(load_canonical(CANONICAL_FILE), df)
+        if not changes and not force and previous_manifest.get('sha256'):
+            if not DAILY_COUNTS_FILE.exists():
+                write_daily_counts(df, previous_manifest.get('canonical_sha256'),
+                                   sha256=previous_manifest.get('sha256'))
+            if not STATIC_HTML_FILE.exists():
+                _write_static_page()
+            return {**previous_manifest, 'unchanged': True}
+
+    extra = {
+        'canonical': CANONICAL_FILE.name,
+        'canonical_sha256': write_canonical(df, CANONICAL_FILE),
+    }
+    write_daily_counts(df, extra['canonical_sha256'], sha256=file_sha256(snapshot))
+    staged = staging_path(live_path)
+    try:
+        os.link(snapshot, staged)
+    except OSError:
+        # Filesystem without hard links (e.g. some synced folders) - fall back to a copy
+        manifest = publish_copy(snapshot, live_path, received_time, snapshot_name, extra)
+    else:
+        try:
+            manifest = atomic_publish(staged, live_path, received_time, snapshot_name, extra=extra)
+        finally:
+            if staged.exists():
+                staged.unlink()
+
+    # leaderboard.html is one of the PUBLISHED_FILES, so every publish path writes it
+    _write_static_page()
+
+    # History for as-of queries and the change log; the live data is already
+    # published, so never fail here
+    try:
+        received_time = received_time or datetime.now()
+        append_snapshot(df, received_time, snapshot_name)
+        if changes is not None:
+            record_changes(changes, received_time,
+                           previous_manifest.get('canonical_sha256'), extra['canonical_sha256'])
+        update_timeline(df, received_time, changes,
+                        previous_manifest.get('canonical_sha256'), extra['canonical_sha256'])
+    except Exception as e:
+        print(f"⚠️ Snapshot history not updated: {e}")
+    return manifest
+
+
+if __name__ == "__main__":
+    entries = read_index()
+    current = read_manifest().get('snapshot')
+    print(f"📚 {len(entries)} stored reports in {STORE_DIR.name}/")
+    for entry in entries:
+        marker = "👉" if f"{STORE_DIR.name}/{entry['snapshot']}" == current else "  "
+        print(f"{marker} {entry['received_time']}  {entry['snapshot']}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Report History Retention
+Keeps the project folder bounded: every report from today, the newest one per day
+for the last month, then the newest one per week. Everything else is appended to a
+single columnar archive (history/archive.parquet) before its xlsx is deleted, so no
+export is ever lost.
+
+Usage:
+    python retention.py            # show what would be kept, archived and removed
+    python retention.py --apply
+"""
+
+import argparse
+import configparser
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from canonical_export import canonicalize
+from publish import read_manifest, write_json_atomic
+from report_store import INDEX_FILE, STORE_DIR, read_index
+
+APP_DIR = Path(__file__).parent
+ARCHIVE_FILE = APP_DIR / "history" / "archive.parquet"
+
+# Files produced by the ingest scripts over time
+HISTORY_GLOBS = [
+    "leaderboard_backup_*.xlsx",
+    "leaderboard_from_vanpaper_*.xlsx",
+    "leaderboard_vanpaper_*.xlsx",
+    "vanpaper_temp_*.xlsx",
+    "backups/*.xlsx",
+    "reports/vanpaper_*.xlsx",
+]
+
+# Leftovers from interrupted runs - never kept, only archived if readable
+TEMP_PREFIXES = ("vanpaper_temp_",)
+
+DEFAULTS = {
+    'KEEP_ALL_DAYS': 1,
+    'DAILY_DAYS': 30,
+    'WEEKLY_WEEKS': 26,
+}
+
+_TIMESTAMP = re.compile(r"(\d{8})_(\d{6})")
+
+
+def load_policy():
+    """Read [RETENTION_SETTINGS] from automation_config.txt"""
+    config = configparser.ConfigParser()
+    config.read(APP_DIR / "automation_config.txt")
+    return {key: config.getint('RETENTION_SETTINGS', key, fallback=value)
+            for key, value in DEFAULTS.items()}
+
+
+def _file_time(path):
+    """Timestamp embedded in the file name, falling back to the file's mtime"""
+    match = _TIMESTAMP.search(path.name)
+    if match:
+        try:
+            return datetime.strptime("".join(match.groups()), '%Y%m%d%H%M%S')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(path.stat().st_mtime)
+
+
+def history_files():
+    """All historical report files, oldest first, as (time, path)"""
+    files = []
+    for pattern in HISTORY_GLOBS:
+        files.extend((_file_time(path), path) for path in APP_DIR.glob(pattern))
+    return sorted(files, key=lambda item: item[0])
+
+
+def plan(policy=None, now=None):
+    """Split history files into (keep, archive) lists according to the policy"""
+    policy = policy or load_policy()
+    now = now or datetime.now()
+    today = now.date()
+
+    live_snapshot = read_manifest().get('snapshot')
+    protected = {APP_DIR / live_snapshot} if live_snapshot else set()
+
+    keep, archive = [], []
+    buckets = {}
+    for file_time, path in reversed(history_files()):  # newest first
+        if path.name.startswith(TEMP_PREFIXES):
+            archive.append((file_time, path))
+            continue
+        if path in protected:
+            keep.append((file_time, path))
+            continue
+
+        age_days = (today - file_time.date()).days
+        if age_days < policy['KEEP_ALL_DAYS']:
+            bucket = None
+        elif age_days < policy['DAILY_DAYS']:
+            bucket = ('day', file_time.date())
+        elif age_days < policy['DAILY_DAYS'] + 7 * policy['WEEKLY_WEEKS']:
+            bucket = ('week',) + tuple(file_time.isocalendar()[:2])
+        else:
+            archive.append((file_time, path))
+            continue
+
+        if bucket is None or bucket not in buckets:
+            if bucket is not None:
+                buckets[bucket] = path
+            keep.append((file_time, path))
+        else:
+            archive.append((file_time, path))
+
+    return sorted(keep), sorted(archive)
+
+
+def _archive_frame(file_time, path):
+    """Canonical rows of one report, tagged with when it was received and where it came from"""
+    df = canonicalize(pd.read_excel(path))
+    df.insert(0, "Snapshot Time", pd.Timestamp(file_time))
+    df.insert(1, "Source File", path.relative_to(APP_DIR).as_posix())
+    return df
+
+
+def compact(files, archive_path=ARCHIVE_FILE):
+    """Append the given files' rows to the parquet archive (skipping sources already in it).
+    Returns the paths whose rows are now in the archive; unreadable files are left out."""
+    archive_path = Path(archive_path)
+    existing = pd.read_parquet(archive_path) if archive_path.exists() else None
+    archived_sources = set(existing["Source File"]) if existing is not None else set()
+
+    archived, frames = set(), []
+    for file_time, path in files:
+        if path.relative_to(APP_DIR).as_posix() in archived_sources:
+            archived.add(path)
+            continue
+        try:
+            frames.append(_archive_frame(file_time, path))
+        except Exception as e:
+            logging.warning(f"Could not read {path.name}, not archived: {e}")
+            continue
+        archived.add(path)
+    if not frames:
+        return archived
+
+    combined = pd.concat(([existing] if existing is not None else []) + frames, ignore_index=True)
+    combined = combined.sort_values(["Snapshot Time", "Source File"], kind="mergesort")
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = archive_path.with_name(f".{archive_path.name}.tmp")
+    combined.to_parquet(temp_path, index=False)
+    os.replace(temp_path, archive_path)
+    return archived
+
+
+def apply_retention(policy=None, now=None, verbose=True):
+    """Archive and delete everything the policy does not keep; returns (kept, removed)"""
+    keep, archive = plan(policy, now)
+    if not archive:
+        return len(keep), 0
+
+    archived = compact(archive)
+
+    removed = []
+    for _, path in archive:
+        # Unreadable reports stay on disk; leftovers from interrupted runs are never kept
+        if path not in archived and not path.name.startswith(TEMP_PREFIXES):
+            continue
+        try:
+            path.unlink()
+            removed.append(path)
+            if verbose:
+                print(f"🗑️ {path.relative_to(APP_DIR)}")
+        except OSError as e:
+            print(f"⚠️ Could not remove {path.name}: {e}")
+
+    # Keep the store index as the full history; mark which snapshots now live only in the archive
+    removed_names = {path.name for path in removed if path.parent == STORE_DIR}
+    if removed_names:
+        entries = read_index()
+        for entry in entries:
+            if entry['snapshot'] in removed_names:
+                entry['archived'] = True
+        write_json_atomic(INDEX_FILE, {'snapshots': entries})
+
+    return len(keep), len(removed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply the report history retention policy")
+    parser.add_argument('--apply', action='store_true', help="archive and delete (default is a dry run)")
+    args = parser.parse_args()
+
+    policy = load_policy()
+    print(f"📋 Policy: all of the last {policy['KEEP_ALL_DAYS']} day(s), one per day for "
+          f"{policy['DAILY_DAYS']} days, one per week for {policy['WEEKLY_WEEKS']} weeks")
+
+    if args.apply:
+        kept, removed = apply_retention(policy)
+        print(f"✅ Kept {kept} files, archived and removed {removed}")
+    else:
+        keep, archive = plan(policy)
+        for file_time, path in keep:
+            print(f"   keep     {file_time:%Y-%m-%d %H:%M}  {path.relative_to(APP_DIR)}")
+        for file_time, path in archive:
+            print(f"   archive  {file_time:%Y-%m-%d %H:%M}  {path.relative_to(APP_DIR)}")
+        print(f"💡 {len(archive)} file(s) would be archived - run with --apply")
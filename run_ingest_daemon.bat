@@ -0,0 +1,11 @@
+@echo off
+REM Van Paper Ingest Daemon - leave this window open
+echo Van Paper Ingest Daemon
+echo =======================
+echo Started: %date% %time%
+echo.
+
+cd /d "c:\Users\Isaac\OneDrive - Van Paper Company\Python_Projects\Sales_Leaderboard"
+
+echo Listening for new Van Paper reports (Ctrl+C to stop)...
+python ingest_daemon.py
@@ -0,0 +1,202 @@
+"""
+Automation Run Lock and Job Queue
+Keeps the scheduled scans, continuous monitor, one-click updater and ingest daemon
+from writing leaderboard_new.xlsx or running git at the same time.
+A scan that finds the lock busy is queued and run again by whoever holds it;
+jobs with their own payload (the daemon's report) always run themselves.
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+APP_DIR = Path(__file__).parent
+LOCK_FILE = APP_DIR / "automation.lock"
+QUEUE_FILE = APP_DIR / "automation_queue.json"
+QUEUE_LOCK_FILE = APP_DIR / "automation_queue.lock"
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd):
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class FileLock:
+    """Cross-process lock held on an open file; released automatically if the process dies"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.fd = None
+
+    def acquire(self, wait=False, timeout=600, poll_interval=0.5):
+        """Take the lock; returns False if it is held elsewhere and we did not wait long enough"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if not wait or time.monotonic() >= deadline:
+                os.close(fd)
+                return False
+            time.sleep(poll_interval)
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is None:
+            return
+        try:
+            _unlock(self.fd)
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        self.acquire(wait=True)
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _read_queue():
+    try:
+        with open(QUEUE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def _write_queue(entries):
+    temp_file = QUEUE_FILE.with_suffix(".tmp")
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    os.replace(temp_file, QUEUE_FILE)
+
+
+def enqueue(trigger):
+    """Record a pending run request; duplicate triggers collapse into one entry"""
+    with FileLock(QUEUE_LOCK_FILE):
+        entries = _read_queue()
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        for entry in entries:
+            if entry['trigger'] == trigger:
+                entry['count'] += 1
+                entry['last_requested'] = now
+                break
+        else:
+            entries.append({'trigger': trigger, 'count': 1,
+                            'first_requested': now, 'last_requested': now})
+        _write_queue(entries)
+
+
+def drain():
+    """Take every pending request off the queue"""
+    with FileLock(QUEUE_LOCK_FILE):
+        entries = _read_queue()
+        if entries:
+            _write_queue([])
+        return entries
+
+
+def pending():
+    """List pending requests without removing them"""
+    with FileLock(QUEUE_LOCK_FILE):
+        return _read_queue()
+
+
+def _write_owner(lock, trigger):
+    """Note who holds the lock, for anyone inspecting automation.lock"""
+    info = f"{os.getpid()} {trigger} {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    os.lseek(lock.fd, 0, os.SEEK_SET)
+    os.ftruncate(lock.fd, 0)
+    os.write(lock.fd, info.encode())
+
+
+def _request(trigger):
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return {'trigger': trigger, 'count': 1, 'first_requested': now, 'last_requested': now}
+
+
+def run_exclusive(trigger, job, wait=False, timeout=600, merge=True):
+    """Run job(triggers) under the automation lock.
+
+    Returns (ran, result). Once a caller holds the lock its own job always runs.
+    A caller that does not get the lock (wait is False, or the timeout passed)
+    leaves its trigger queued, and a holder with merge=True runs its job again for
+    queued triggers - every scan does the same work, so one pass serves them all.
+    Jobs that carry their own payload (the daemon's one report) pass merge=False:
+    they never queue, never run for another caller's trigger, and leave queued
+    triggers for the next merging run.
+    """
+    lock = FileLock(LOCK_FILE)
+    ran = False
+    result = None
+
+    if lock.acquire(wait=wait, timeout=timeout):
+        triggers = [_request(trigger)]
+    else:
+        if not merge:
+            return ran, result
+        enqueue(trigger)
+        # The holder may have released between our attempt and the enqueue; if it
+        # still holds the lock it picks up our trigger after its own pass
+        if not lock.acquire():
+            return ran, result
+        triggers = []
+
+    while True:
+        try:
+            _write_owner(lock, trigger)
+            if merge:
+                triggers += drain()
+            while triggers:
+                result = job(triggers)
+                ran = True
+                triggers = drain() if merge else []
+        finally:
+            lock.release()
+
+        # A request may have been queued between our last drain and the release
+        if not merge or not pending() or not lock.acquire():
+            return ran, result
+
+
+if __name__ == "__main__":
+    holder = FileLock(LOCK_FILE)
+    if holder.acquire():
+        holder.release()
+        print("🔓 No automation run in progress")
+    else:
+        try:
+            owner = LOCK_FILE.read_text().strip()
+        except OSError:
+            owner = "details unavailable while locked"
+        print(f"🔒 Automation run in progress: {owner}")
+    queued = pending()
+    print(f"📋 Pending requests: {len(queued)}")
+    for entry in queued:
+        print(f"   {entry['trigger']} x{entry['count']} (last {entry['last_requested']})")
@@ -6,14 +6,15 @@ Runs at 7:32 AM CST and 2:02 PM CST (14:02) to process Van Paper reports
 
 import win32com.client
 import os
-import shutil
-import subprocess
-import pandas as pd
 import configparser
 from datetime import datetime, timedelta
 from pathlib import Path
 import time
 
+from run_lock import run_exclusive
+from ingest import ingest_report, update_live_app
+from report_store import save_report
+
 def load_config():
     """Load configuration from automation_config.txt"""
     config = configparser.ConfigParser()
@@ -112,51 +113,24 @@ def process_van_paper_email(email_data):
     try:
         current_dir = Path(__file__).parent
         
-        # Create timestamp for files
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save the Excel attachment
-        temp_excel = current_dir / f"vanpaper_temp_{timestamp}.xlsx"
-        
+        # Save the Excel attachment once, into the report store
         print(f"💾 Saving Excel attachment...")
-        email_data['attachment'].SaveAsFile(str(temp_excel))
+        snapshot = save_report(lambda path: email_data['attachment'].SaveAsFile(str(path)),
+                               email_data['received_time'])
+        print(f"💾 Stored as reports/{snapshot.name}")
         
-        # Verify the Excel file
+        # Verify the report, link leaderboard_new.xlsx to it (hard link swapped in with
+        # one rename), write the canonical CSV and record the sync
         try:
-            df = pd.read_excel(temp_excel)
-            print(f"✅ Excel verified: {len(df)} rows, {len(df.columns)} columns")
-            print(f"📋 Columns: {list(df.columns)}")
+            result = ingest_report(snapshot, email_data['received_time'])
         except Exception as e:
-            print(f"❌ Error reading Excel file: {e}")
+            print(f"❌ Error reading or publishing report: {e}")
             return False
-        
-        # Create backup of current leaderboard
-        main_leaderboard = current_dir / "leaderboard_new.xlsx"
-        if main_leaderboard.exists():
-            backup_name = f"leaderboard_backup_{timestamp}.xlsx"
-            backup_path = current_dir / backup_name
-            shutil.copy2(main_leaderboard, backup_path)
-            print(f"💾 Created backup: {backup_name}")
-        
-        # Replace the main leaderboard file
-        try:
-            # Remove old file if it exists
-            if main_leaderboard.exists():
-                main_leaderboard.unlink()
-            
-            # Copy new file
-            shutil.copy2(temp_excel, main_leaderboard)
-            print(f"✅ Updated leaderboard_new.xlsx")
-            
-            # Clean up temp file
-            temp_excel.unlink()
-            
-        except Exception as e:
-            print(f"⚠️ File replacement issue: {e}")
-            # Just rename temp file if we can't replace
-            final_name = current_dir / f"leaderboard_vanpaper_{timestamp}.xlsx"
-            shutil.move(temp_excel, final_name)
-            print(f"💾 Saved as: {final_name.name}")
+        print(f"✅ Excel verified: {result['rows']} rows")
+        if result['unchanged']:
+            print(f"✅ No rows changed - live data kept (version {result['version']})")
+        else:
+            print(f"✅ Updated leaderboard_new.xlsx (version {result['version']})")
         
         return True
         
@@ -164,46 +138,6 @@ def process_van_paper_email(email_data):
         print(f"❌ Error processing email: {e}")
         return False
 
-def update_live_app(email_received_time):
-    """Update git and push to live Streamlit app"""
-    
-    print("\n🚀 Updating live Streamlit app...")
-    
-    try:
-        current_dir = Path(__file__).parent
-        
-        # Git operations
-        print("📝 Adding files to git...")
-        subprocess.run(['git', 'add', 'leaderboard_new.xlsx'], 
-                      cwd=current_dir, capture_output=True, check=True)
-        
-        # Commit with timestamp
-        commit_message = f"Auto-update from Van Paper report {email_received_time.strftime('%Y-%m-%d %I:%M %p CST')}"
-        print(f"📝 Committing: {commit_message}")
-        subprocess.run(['git', 'commit', '-m', commit_message], 
-                      cwd=current_dir, capture_output=True, check=True)
-        
-        # Push to live app
-        print("🌐 Pushing to live app...")
-        result = subprocess.run(['git', 'push'], 
-                              cwd=current_dir, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print("✅ Successfully updated live app!")
-            print("🌐 Live app: https://vpsales.streamlit.app/")
-            print("⏱️ App will refresh in 1-2 minutes")
-            return True
-        else:
-            print(f"⚠️ Git push failed: {result.stderr}")
-            return False
-            
-    except subprocess.CalledProcessError as e:
-        print(f"⚠️ Git operation failed: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Update error: {e}")
-        return False
-
 def main():
     """Main automation function"""
     
@@ -234,10 +168,12 @@ def main():
         print("❌ Failed to process Van Paper email")
         return False
     
-    # Update the live app
+    # Update the live app - commits and pushes the published files
+    print("\n🚀 Updating live Streamlit app...")
     if not update_live_app(email_data['received_time']):
         print("⚠️ Live app update had issues")
         return False
+    print("🌐 Live app: https://vpsales.streamlit.app/ (refreshes in 1-2 minutes)")
     
     print("\n🎉 SUCCESS! Van Paper automation completed!")
     print(f"📧 Processed email from: {email_data['received_time'].strftime('%I:%M %p')}")
@@ -246,7 +182,10 @@ def main():
     return True
 
 if __name__ == "__main__":
-    success = main()
+    ran, success = run_exclusive("scheduled_automation", lambda triggers: main())
+    if not ran:
+        print("⏭️ Another automation run is in progress - request queued for it")
+        success = True
     
     print("\n" + "=" * 50)
     if success:
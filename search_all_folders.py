@@ -6,6 +6,8 @@ This will check Inbox, Junk, Sent Items, and other folders
 import win32com.client
 from datetime import datetime, timedelta
 
+from mailbox_table import fetch_message_rows, open_message
+
 def search_all_outlook_folders():
     """Search ALL Outlook folders for the 9:55 AM email"""
     
@@ -44,39 +46,31 @@ def search_all_outlook_folders():
             
             try:
                 folder = namespace.GetDefaultFolder(folder_id)
-                messages = folder.Items
-                messages.Sort("[ReceivedTime]", True)
+                
+                # Pull metadata for the whole timeframe in one batched table query
+                rows = fetch_message_rows(folder, start_time, end_time, limit=100)
                 
                 folder_emails = []
                 
-                count = 0
-                for message in messages:
-                    count += 1
-                    if count > 100:  # Limit per folder
-                        break
-                        
+                for row in rows:
                     try:
-                        # Skip if no received time
-                        if not hasattr(message, 'ReceivedTime') or not message.ReceivedTime:
-                            continue
+                        attachment_names = []
+                        if row['has_attachments']:
+                            # Only open the full message for candidates with attachments
+                            message = open_message(namespace, row)
+                            attachment_names = [att.FileName for att in message.Attachments]
+                        
+                        email_info = {
+                            'folder': folder_name,
+                            'time': row['received_time'],
+                            'sender': row['sender'] or 'Unknown',
+                            'subject': row['subject'] or 'No Subject',
+                            'attachments': len(attachment_names),
+                            'attachment_names': attachment_names
+                        }
                         
-                        # Check if in our timeframe (9:50-10:05 AM)
-                        if message.ReceivedTime >= start_time and message.ReceivedTime <= end_time:
-                            
-                            sender = getattr(message, 'SenderEmailAddress', 'Unknown')
-                            subject = getattr(message, 'Subject', 'No Subject')
-                            
-                            email_info = {
-                                'folder': folder_name,
-                                'time': message.ReceivedTime,
-                                'sender': sender,
-                                'subject': subject,
-                                'attachments': message.Attachments.Count,
-                                'attachment_names': [att.FileName for att in message.Attachments] if message.Attachments.Count > 0 else []
-                            }
-                            
-                            folder_emails.append(email_info)
-                            all_found_emails.append(email_info)
+                        folder_emails.append(email_info)
+                        all_found_emails.append(email_info)
                 
                     except Exception as e:
                         # Skip problematic messages
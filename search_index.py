@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Customer Search Index
+Trigram index over customer names, Customer Numbers and rep names, built once per
+data version from the model's customer table (leaderboard_model.customer_table).
+A query looks up the postings of its trigrams, intersects them (rarest first) and
+only checks the few surviving rows, so search time tracks the matches rather than
+the number of customers. Queries shorter than a trigram scan the texts directly.
+
+Usage:
+    python search_index.py "liquor"             # search the live data
+"""
+
+import re
+import sys
+
+import numpy as np
+
+GRAM = 3
+
+# Fields searched, in the order they are joined into a row's text
+SEARCH_FIELDS = ["Customer", "Customer Number", "Salesrep"]
+
+
+def normalize(text):
+    """Lower case, punctuation dropped, single spaces: "O'Brien's  Pub" -> "obriens pub" """
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", str(text).lower())).strip()
+
+
+def _grams(text):
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def build_index(customers):
+    """{'texts': normalized row texts, 'postings': {trigram: sorted row numbers}}"""
+    texts = [" | ".join(normalize(row[field]) for field in SEARCH_FIELDS)
+             for row in customers[SEARCH_FIELDS].to_dict("records")]
+    postings = {}
+    for row_number, text in enumerate(texts):
+        for gram in _grams(text):
+            postings.setdefault(gram, []).append(row_number)
+    return {
+        'texts': texts,
+        'postings': {gram: np.array(rows, dtype=np.int32) for gram, rows in postings.items()},
+    }
+
+
+def candidates(index, query):
+    """Row numbers whose text contains the normalized query"""
+    query = normalize(query)
+    if not query:
+        return np.array([], dtype=np.int32)
+    texts = index['texts']
+    if len(query) < GRAM:
+        rows = range(len(texts))
+    else:
+        postings = sorted((index['postings'].get(gram) for gram in _grams(query)),
+                          key=lambda rows: -1 if rows is None else len(rows))
+        if postings[0] is None:
+            return np.array([], dtype=np.int32)
+        rows = postings[0]
+        for other in postings[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+            if len(rows) == 0:
+                break
+    # Trigrams can all appear without the query appearing in order - confirm each one
+    return np.array([row for row in rows if query in texts[row]], dtype=np.int32)
+
+
+def search(index, customers, query, limit=25):
+    """Matching customer rows (with Status), names that start with the query first"""
+    rows = candidates(index, query)
+    if len(rows) == 0:
+        return customers.iloc[0:0]
+    matches = customers.iloc[rows]
+    starts = matches["Customer"].map(normalize).str.startswith(normalize(query))
+    return matches.assign(_starts=starts).sort_values("_starts", ascending=False, kind="stable") \
+                  .drop(columns="_starts").head(limit)
+
+
+if __name__ == "__main__":
+    from data_source import local_data
+    from leaderboard_model import customer_table
+    from vpsales import run
+
+    path, _ = local_data()
+    results = run(path)
+    customers = customer_table(results['counted'], results['pending'], results['violations'])
+    index = build_index(customers)
+    query = " ".join(sys.argv[1:])
+    print(search(index, customers, query).to_string(index=False) if query
+          else f"📇 {len(customers)} customers, {len(index['postings'])} trigrams")
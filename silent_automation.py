@@ -6,14 +6,16 @@ ZERO user interaction - designed for scheduled tasks
 
 import win32com.client
 import os
-import shutil
-import subprocess
-import pandas as pd
 import configparser
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 
+from run_lock import run_exclusive
+from ingest import ingest_report, update_live_app
+from report_store import save_report
+from sync_metadata import record_sync
+
 def load_config():
     """Load configuration silently"""
     config = configparser.ConfigParser()
@@ -105,44 +107,15 @@ def process_van_paper_email(email_data):
     """Process the Van Paper email silently"""
     
     try:
-        current_dir = Path(__file__).parent
-        
-        # Create timestamp for files
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save the Excel attachment
-        temp_excel = current_dir / f"vanpaper_temp_{timestamp}.xlsx"
-        email_data['attachment'].SaveAsFile(str(temp_excel))
-        
-        # Create backup of current file
-        main_leaderboard = current_dir / "leaderboard_new.xlsx"
-        if main_leaderboard.exists():
-            backup_name = f"leaderboard_backup_{timestamp}.xlsx"
-            backup_path = current_dir / backup_name
-            shutil.copy2(main_leaderboard, backup_path)
-        
-        # Replace the main leaderboard file
-        shutil.copy2(temp_excel, main_leaderboard)
+        # Save the Excel attachment once, into the report store
+        snapshot = save_report(lambda path: email_data['attachment'].SaveAsFile(str(path)),
+                               email_data['received_time'])
         
-        # Save a timestamped copy
-        timestamped_copy = current_dir / f"leaderboard_from_vanpaper_{timestamp}.xlsx"
-        shutil.copy2(temp_excel, timestamped_copy)
-        
-        # Clean up temp file
-        temp_excel.unlink()
+        # Publish it and record the sync with its row counts (hard link + atomic rename)
+        ingest_report(snapshot, email_data['received_time'])
         
         # Git update - silently
-        git_commands = [
-            ["git", "add", "."],
-            ["git", "commit", "-m", f"Auto-update from Van Paper {email_data['received_time'].strftime('%I:%M %p')} on {email_data['received_time'].strftime('%Y-%m-%d')}"],
-            ["git", "push"]
-        ]
-        
-        for cmd in git_commands:
-            try:
-                subprocess.run(cmd, capture_output=True, text=True, cwd=current_dir, timeout=30)
-            except Exception:
-                pass
+        update_live_app(email_data['received_time'])
         
         return True
         
@@ -179,9 +152,11 @@ def main():
         # No emails found - still create sync timestamp to show we checked
         with open("last_sync.txt", "w") as f:
             f.write(start_time.strftime('%Y-%m-%d %H:%M:%S'))
+        record_sync()
         return True
 
 if __name__ == "__main__":
     # ZERO user interaction - just run and exit
-    success = main()
-    sys.exit(0 if success else 1)
+    ran, success = run_exclusive("silent_automation", lambda triggers: main())
+    # A skipped run is queued for the current lock holder, not a failure
+    sys.exit(0 if success or not ran else 1)
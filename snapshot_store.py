@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Snapshot History Store
+Every published export is appended to history/snapshots/ as two parquet files -
+its canonical rows and the standings computed from them - keyed by the email's
+ReceivedTime. Files are never rewritten; index.json lists them sorted by time,
+so "what were the standings on date X?" is a bisect plus one small parquet read.
+
+Usage:
+    python snapshot_store.py list
+    python snapshot_store.py as-of "2025-10-15 17:00"    # standings at that moment
+    python snapshot_store.py backfill                     # add reports/ and the retention archive
+"""
+
+import argparse
+import hashlib
+import io
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from canonical_export import canonicalize, load_canonical
+from contests import contest_rules, current_contest, in_window, load_contests
+from leaderboard_model import build_standings, compute
+from publish import read_json, write_json_atomic
+
+APP_DIR = Path(__file__).parent
+SNAPSHOT_DIR = APP_DIR / "history" / "snapshots"
+SNAPSHOT_INDEX = SNAPSHOT_DIR / "index.json"
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_cache_lock = threading.Lock()
+_index_cache = {}
+
+
+def _as_datetime(value):
+    """Naive datetime from a datetime, pywintypes time, Timestamp or 'YYYY-mm-dd HH:MM:SS'"""
+    if isinstance(value, str):
+        return datetime.strptime(value, TIME_FORMAT)
+    return datetime(value.year, value.month, value.day, value.hour, value.minute, value.second)
+
+
+def read_snapshot_index(index_path=SNAPSHOT_INDEX):
+    """Return (times, entries) sorted by received time; re-read only when index.json changes"""
+    index_path = Path(index_path)
+    try:
+        mtime = index_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return [], []
+
+    with _cache_lock:
+        cached = _index_cache.get(index_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        entries = read_json(index_path).get('snapshots', [])
+        times = [_as_datetime(entry['received_time']) for entry in entries]
+        _index_cache[index_path] = (mtime, (times, entries))
+        return times, entries
+
+
+def _part_path(directory, kind, received_time, sha256):
+    return directory / f"{kind}_{received_time.strftime('%Y%m%d_%H%M%S')}_{sha256[:12]}.parquet"
+
+
+def _write_part(df, path):
+    """Write one parquet part via a temp file so a crash never leaves half a part"""
+    temp_path = path.with_name(f".{path.name}.tmp")
+    df.to_parquet(temp_path, index=False)
+    temp_path.replace(path)
+
+
+def append_snapshot(df, received_time, source=None, index_path=SNAPSHOT_INDEX):
+    """Store an export and its standings; returns the index entry (the existing one if
+    this exact export is already stored for that received time)"""
+    received_time = _as_datetime(received_time)
+    canonical = canonicalize(df)
+    text = canonical.to_csv(index=False, lineterminator="\n")
+    sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    times, entries = read_snapshot_index(index_path)
+    for entry in entries:
+        if entry['received_time'] == received_time.strftime(TIME_FORMAT) and entry['sha256'] == sha256:
+            return entry
+
+    contest = current_contest(load_contests())
+    rules = contest_rules(contest)
+    results = compute(load_canonical(io.StringIO(text)), rules)
+    # Only invoices inside the contest window count, as in the app's standings
+    counted = in_window(results['counted'], contest) if contest else results['counted']
+    standings = build_standings(counted, rules)
+
+    directory = Path(index_path).parent
+    directory.mkdir(parents=True, exist_ok=True)
+    rows_path = _part_path(directory, "rows", received_time, sha256)
+    standings_path = _part_path(directory, "standings", received_time, sha256)
+    _write_part(canonical, rows_path)
+    _write_part(standings, standings_path)
+
+    entry = {
+        'received_time': received_time.strftime(TIME_FORMAT),
+        'stored_at': datetime.now().strftime(TIME_FORMAT),
+        'sha256': sha256,
+        'rows': rows_path.name,
+        'standings': standings_path.name,
+        'row_count': int(len(canonical)),
+        'counted': int(len(counted)),
+        'source': str(source) if source else None,
+    }
+    position = bisect_right(times, received_time)
+    updated = entries[:position] + [entry] + entries[position:]
+    write_json_atomic(index_path, {'snapshots': updated})
+    return entry
+
+
+def entry_as_of(when, index_path=SNAPSHOT_INDEX):
+    """Index entry of the newest snapshot received at or before `when`, or None"""
+    times, entries = read_snapshot_index(index_path)
+    position = bisect_right(times, _as_datetime(when))
+    return entries[position - 1] if position else None
+
+
+def load_rows(entry, index_path=SNAPSHOT_INDEX):
+    """A snapshot's export rows, with the same dtypes the app gets from the live file"""
+    rows = pd.read_parquet(Path(index_path).parent / entry['rows'])
+    return load_canonical(io.StringIO(rows.to_csv(index=False, lineterminator="\n")))
+
+
+def rows_as_of(when, index_path=SNAPSHOT_INDEX):
+    """The export rows that were live at `when` (empty DataFrame before the first snapshot)"""
+    entry = entry_as_of(when, index_path)
+    if entry is None:
+        return pd.DataFrame()
+    return load_rows(entry, index_path)
+
+
+def standings_as_of(when, index_path=SNAPSHOT_INDEX):
+    """The precomputed standings that were live at `when`"""
+    entry = entry_as_of(when, index_path)
+    if entry is None:
+        return pd.DataFrame()
+    return pd.read_parquet(Path(index_path).parent / entry['standings'])
+
+
+def backfill():
+    """Add stored reports and archived rows that are not in the store yet"""
+    from report_store import STORE_DIR, read_index
+    from retention import ARCHIVE_FILE
+
+    added = 0
+    for stored in read_index():
+        path = STORE_DIR / stored['snapshot']
+        if path.exists():
+            before = len(read_snapshot_index()[1])
+            append_snapshot(pd.read_excel(path), stored['received_time'], f"reports/{stored['snapshot']}")
+            added += len(read_snapshot_index()[1]) - before
+
+    if ARCHIVE_FILE.exists():
+        archive = pd.read_parquet(ARCHIVE_FILE)
+        for (snapshot_time, source), rows in archive.groupby(["Snapshot Time", "Source File"]):
+            before = len(read_snapshot_index()[1])
+            append_snapshot(rows.drop(columns=["Snapshot Time", "Source File"]), snapshot_time, source)
+            added += len(read_snapshot_index()[1]) - before
+    return added
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the snapshot history store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list stored snapshots")
+    as_of = commands.add_parser("as-of", help="standings at a point in time")
+    as_of.add_argument("when", help="'YYYY-mm-dd HH:MM:SS' (or just a date)")
+    commands.add_parser("backfill", help="add reports/ and history/archive.parquet to the store")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        _, entries = read_snapshot_index()
+        print(f"📚 {len(entries)} snapshots in {SNAPSHOT_DIR.relative_to(APP_DIR)}")
+        for entry in entries:
+            print(f"   {entry['received_time']}  {entry['row_count']:>4} rows  "
+                  f"{entry['counted']:>3} counted  {entry.get('source') or ''}")
+    elif args.command == "as-of":
+        when = pd.Timestamp(args.when).to_pydatetime()
+        if len(args.when) <= 10:
+            when = when.replace(hour=23, minute=59, second=59)
+        entry = entry_as_of(when)
+        if entry is None:
+            print(f"❌ No snapshot at or before {when}")
+        else:
+            print(f"📅 Standings as of {when} (report received {entry['received_time']})")
+            print(standings_as_of(when).to_string(index=False))
+    else:
+        print(f"✅ Added {backfill()} snapshots")
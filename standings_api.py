@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Standings JSON API
+A small HTTP service for screens that only need the numbers (warehouse TV,
+sales-floor dashboard) instead of the full Streamlit app.
+Responses are built once per data version and kept in memory as ready-to-send
+JSON bytes, so a request never touches pandas; ETag / Last-Modified let pollers
+get a 304 when nothing changed.
+
+Endpoints:
+    /api/standings          current standings for the running contest
+    /api/reps               every rep with counted / pending / violation totals
+    /api/reps/<salesrep>    that rep's customer lists (URL-encoded name)
+
+Usage:
+    python standings_api.py                 # http://0.0.0.0:8766/api/standings
+    python standings_api.py --port 9000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from contests import current_contest, load_contests, period_label
+from data_server import DataHandler
+from data_source import current_data, sync_metadata_path
+from leaderboard_model import customer_number_text
+from sync_metadata import read_sync_metadata
+from vpsales import run
+
+# How often (at most) requests check whether new data was published
+VERSION_CHECK_SECONDS = 1.0
+
+_lock = threading.Lock()
+_cache = {'version': None, 'synced_at': None, 'checked_at': 0.0, 'standings': None,
+          'responses': {}, 'last_modified': None}
+
+
+def _records(df):
+    if "Customer Number" in df.columns:
+        # The export mixes numbers and text in this column; always send text
+        df = df.assign(**{"Customer Number": df["Customer Number"].map(customer_number_text)})
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _body(document):
+    body = json.dumps(document).encode("utf-8")
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def build_responses(path, version):
+    """Compute the model once and serialize every endpoint: ({url path: (body, etag)},
+    the /api/standings document without its synced_at)"""
+    contest = current_contest(load_contests())
+    results = run(path, contest)
+    contest_info = ({'id': contest['id'], 'name': contest['name'], 'period': period_label(contest)}
+                    if contest else None)
+
+    standings = {
+        'version': version,
+        'contest': contest_info,
+        'standings': _records(results['standings']),
+    }
+    responses = {}
+
+    reps = set()
+    for name in ('counted', 'pending', 'violations'):
+        if len(results[name]):
+            reps.update(results[name]["Salesrep"].dropna())
+
+    summary = []
+    for rep in sorted(reps):
+        lists = {name: _records(df[df["Salesrep"] == rep]) if len(df) else []
+                 for name, df in results.items() if name != 'standings'}
+        url = f"/api/reps/{quote(rep, safe='')}"
+        responses[url] = _body({'version': version, 'salesrep': rep, **lists})
+        summary.append({'salesrep': rep, 'url': url, **{name: len(rows) for name, rows in lists.items()}})
+    responses['/api/reps'] = _body({'version': version, 'reps': summary})
+    return responses, standings
+
+
+def _with_sync_time(responses, standings, synced_at):
+    """The responses with /api/standings serialized for this sync time - no pandas"""
+    return {**responses, '/api/standings': _body({**standings, 'synced_at': synced_at})}
+
+
+def current_responses():
+    """Responses for the live data version, rebuilding only when the version changes"""
+    with _lock:
+        now = time.monotonic()
+        if _cache['version'] is not None and now - _cache['checked_at'] < VERSION_CHECK_SECONDS:
+            return _cache['responses'], _cache['last_modified']
+        _cache['checked_at'] = now
+
+        # The version carries the data's sha, so only new data reruns the pipeline
+        path, version = current_data()
+        synced_at = read_sync_metadata(sync_metadata_path()).get('synced_at')
+        if version != _cache['version']:
+            responses, standings = build_responses(path, version)
+            try:
+                mtime = Path(path).stat().st_mtime
+            except OSError:
+                mtime = time.time()
+            # Swap in the new set as a whole; readers holding the old dict keep a consistent view
+            _cache.update(version=version, synced_at=synced_at, standings=standings, last_modified=mtime,
+                          responses=_with_sync_time(responses, standings, synced_at))
+        elif synced_at != _cache['synced_at']:
+            # A "no new data" sync only moves synced_at - re-serialize /api/standings alone
+            _cache.update(synced_at=synced_at,
+                          responses=_with_sync_time(_cache['responses'], _cache['standings'], synced_at))
+        return _cache['responses'], _cache['last_modified']
+
+
+def _rep_url(route):
+    """Re-encode a /api/reps/<name> path the way the cache keys are encoded"""
+    prefix = '/api/reps/'
+    if not route.startswith(prefix):
+        return route
+    return prefix + quote(unquote(route[len(prefix):]), safe='')
+
+
+class ApiHandler(DataHandler):
+    """Serves cached JSON; conditional-request handling is shared with data_server"""
+
+    def _send_file(self, include_body):
+        try:
+            responses, mtime = current_responses()
+        except Exception as e:
+            self.send_error(503, f"Standings unavailable: {e}")
+            return
+
+        route = self.path.split('?', 1)[0].rstrip('/')
+        response = responses.get(route) or responses.get(_rep_url(route))
+        if response is None:
+            self.send_error(404)
+            return
+
+        body, etag = response
+        last_modified = formatdate(mtime, usegmt=True)
+        if self._not_modified(etag, mtime):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+
+def serve(host='0.0.0.0', port=8766):
+    """Serve the API until interrupted"""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    print(f"📡 Standings API on http://{host}:{port}/api/standings")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Standings API stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve leaderboard standings as JSON")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('VPSALES_API_PORT', 8766)))
+    args = parser.parse_args()
+    serve(args.host, args.port)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Static Image Assets
+Pre-resizes the logo into a few JPEG widths under static/, which Streamlit serves at
+app/static/ (enableStaticServing in .streamlit/config.toml). File names carry a
+content hash, so a browser can keep a downloaded logo for as long as it likes and
+the page only sends a short <img srcset> instead of ~160 KB of base64 per rerun.
+static/assets.json maps each width to its current file.
+
+Usage:
+    python static_assets.py             # rebuild after replacing 0005.jpg
+"""
+
+import base64
+import hashlib
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from publish import read_json, write_json_atomic
+
+APP_DIR = Path(__file__).parent
+STATIC_DIR = APP_DIR / "static"
+ASSETS_FILE = STATIC_DIR / "assets.json"
+LOGO_SOURCE = APP_DIR / "0005.jpg"
+
+# Phone, desktop (the logo is at most 480px wide), desktop on high-DPI screens
+LOGO_WIDTHS = [280, 480, 960]
+JPEG_QUALITY = 82
+
+# Served by Streamlit's static file route
+STATIC_URL = "app/static"
+
+
+def build_logo_variants(source=LOGO_SOURCE, widths=LOGO_WIDTHS):
+    """Write logo-<width>.<hash>.jpg files, drop outdated ones and update assets.json"""
+    STATIC_DIR.mkdir(exist_ok=True)
+    written = {}
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        for width in widths:
+            height = round(image.height * width / image.width)
+            buffer = io.BytesIO()
+            image.resize((width, height), Image.LANCZOS).save(
+                buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            data = buffer.getvalue()
+            name = f"logo-{width}.{hashlib.sha256(data).hexdigest()[:10]}.jpg"
+            (STATIC_DIR / name).write_bytes(data)
+            written[str(width)] = name
+
+    for old in STATIC_DIR.glob("logo-*.jpg"):
+        if old.name not in written.values():
+            old.unlink()
+    write_json_atomic(ASSETS_FILE, {'logo': written})
+    return written
+
+
+def logo_variants():
+    """{width: file name} from assets.json ({} if the variants were never built)"""
+    variants = read_json(ASSETS_FILE).get('logo', {})
+    return {int(width): name for width, name in variants.items() if (STATIC_DIR / name).exists()}
+
+
+def logo_img_tag(css_class="logo-img"):
+    """<img> with a srcset over the static variants; inline base64 when none are built"""
+    variants = logo_variants()
+    if not variants:
+        encoded = base64.b64encode(LOGO_SOURCE.read_bytes()).decode()
+        return f'<img src="data:image/jpeg;base64,{encoded}" class="{css_class}" />'
+    srcset = ", ".join(f"{STATIC_URL}/{name} {width}w" for width, name in sorted(variants.items()))
+    default = variants.get(480) or variants[max(variants)]
+    return (f'<img src="{STATIC_URL}/{default}" srcset="{srcset}" '
+            f'sizes="(max-width: 768px) 90vw, 480px" class="{css_class}" alt="Van Paper" />')
+
+
+if __name__ == "__main__":
+    source_kb = LOGO_SOURCE.stat().st_size // 1024
+    for width, name in build_logo_variants().items():
+        print(f"✅ {name} ({(STATIC_DIR / name).stat().st_size // 1024} KB, source {source_kb} KB)")
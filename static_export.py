@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Static HTML Leaderboard
+Renders the whole leaderboard page - logo, overview, standings, the three customer
+tabs and the sync time - into one self-contained leaderboard.html with no scripts
+or external files. Ingest regenerates it for every new report and every sync
+rewrites just its sync line, so it can be opened offline or served from any static
+host with no Python running at view time.
+Tabs and per-rep lists are plain CSS / <details>, so the page works without JavaScript.
+
+Usage:
+    python static_export.py                     # live data -> leaderboard.html
+    python static_export.py --out site/index.html
+"""
+
+import argparse
+import base64
+import os
+import re
+from datetime import datetime
+from html import escape
+from pathlib import Path
+
+import pandas as pd
+
+from contests import current_contest, load_contests, period_label
+from leaderboard_model import prize_descriptions
+from static_assets import STATIC_DIR, logo_variants
+from vpsales import run
+
+APP_DIR = Path(__file__).parent
+STATIC_HTML_FILE = APP_DIR / "leaderboard.html"
+LOGO_FILE = APP_DIR / "0005.jpg"
+
+RULES_NOTE = ("New ownership, new management, and name changes do not count as new accounts. "
+              "Accounts must have at least 1 order to qualify. Additional ship-tos or separate customers "
+              "associated with the same primary business do not count as additional customers.")
+
+# Medal and name colour for first place, by rank label (same as the app)
+FIRST_PLACE_STYLES = {"1st": ("🥇", "#DAA520"), "2nd": ("🥈", "#C0C0C0"), "3rd": ("🥉", "#CD7F32")}
+
+PAGE_CSS = """
+body { font-family: 'Futura', 'Trebuchet MS', 'Arial', sans-serif; color: #333; margin: 0; }
+main { max-width: 760px; margin: 0 auto; padding: 0 16px 32px; }
+img.logo-img { max-width: 480px; width: 60%; height: auto; display: block; margin: 0 auto; }
+.overview { background-color: #F8F9FA; border-left: 4px solid #6C757D; padding: 20px; margin: 20px 0; border-radius: 5px; }
+.overview h3 { margin-top: 0; color: #495057; }
+.note { font-size: 11px; color: #999; border-top: 1px solid #ddd; padding-top: 12px; margin-top: 12px; line-height: 1.4; }
+.period { margin-top: 15px; text-align: center; font-weight: bold; color: #666; }
+.standing { display: flex; justify-content: space-between; align-items: center; padding: 8px 12px; margin: 4px 0;
+            background-color: #FAFAFA; border-left: 4px solid #E0E0E0; border-radius: 4px; }
+.standing.first { background-color: #FFF9E6; border-left-color: #FFD700; }
+.standing .emoji { font-size: 16px; margin-right: 8px; width: 20px; display: inline-block; }
+.standing .rank { font-size: 16px; font-weight: bold; color: #666; margin-right: 12px; min-width: 30px; display: inline-block; }
+.standing .name { font-size: 18px; }
+.standing .count { font-size: 18px; font-weight: bold; color: #2E8B57; }
+.standing .unit { font-size: 12px; color: #666; margin-left: 4px; }
+.standing .prize { font-size: 16px; font-weight: bold; color: #228B22; min-width: 60px; text-align: right; margin-left: 20px; }
+.tabs > input { display: none; }
+.tabs > label { display: inline-block; padding: 8px 14px; cursor: pointer; border-bottom: 2px solid transparent; }
+.tabs > .panel { display: none; border-top: 1px solid #ddd; padding-top: 8px; }
+#tab-counted:checked ~ label[for=tab-counted], #tab-pending:checked ~ label[for=tab-pending],
+#tab-violations:checked ~ label[for=tab-violations] { border-bottom-color: #FF4B4B; font-weight: bold; }
+#tab-counted:checked ~ #panel-counted, #tab-pending:checked ~ #panel-pending,
+#tab-violations:checked ~ #panel-violations { display: block; }
+details { border: 1px solid #eee; border-radius: 4px; margin: 6px 0; padding: 6px 10px; }
+summary { cursor: pointer; }
+.info { background-color: #E8F4FD; padding: 12px; border-radius: 4px; }
+.synced { text-align: center; margin-top: 30px; color: gray; }
+"""
+
+# Tab id, label, heading, message when empty
+TABS = [
+    ('counted', "🏆 New Customers", "Customers Counted Toward New Customer Goals", "No new customers found."),
+    ('pending', "⏲ Pending Customers", "Customers Not Yet Counted", "No pending customers! 🎉"),
+    ('violations', "❌ Rule Violations", "Customers Excluded Due to Rule Violations", "No rule violations found! ✅"),
+]
+
+
+def _logo_html(logo_path=None):
+    """The logo inlined as a data URI (the largest pre-resized variant when built),
+    or nothing if the file is missing"""
+    if logo_path is None:
+        variants = logo_variants()
+        logo_path = STATIC_DIR / variants[max(variants)] if variants else LOGO_FILE
+    try:
+        encoded = base64.b64encode(Path(logo_path).read_bytes()).decode()
+    except OSError:
+        return ""
+    return f'<img src="data:image/jpeg;base64,{encoded}" class="logo-img" alt="Van Paper" />'
+
+
+def _overview_html(contest):
+    rules = contest['rules'] if contest else None
+    period = period_label(contest) if contest else "September 19th - December 31st"
+    items = "\n".join(f"<li><strong>{escape(title)}:</strong> {escape(text)}</li>"
+                      for title, text in prize_descriptions(rules))
+    return (f'<div class="overview"><h3>Incentive Overview</h3><ul>\n{items}\n</ul>'
+            f'<div class="note"><strong>Note:</strong> {escape(RULES_NOTE)}</div>'
+            f'<div class="period">📅 Incentive Period: {escape(period)}</div></div>')
+
+
+def _standings_html(standings):
+    if len(standings) == 0:
+        return '<div class="info">No customers with invoices found for leaderboard</div>'
+    max_customers = standings["Number of New Customers"].max()
+    rows = []
+    for _, row in standings.iterrows():
+        is_first_place = row["Number of New Customers"] == max_customers
+        emoji, name_color = FIRST_PLACE_STYLES.get(row["Rank"], ("🏆", "#DAA520")) if is_first_place else ("", "#333")
+        rows.append(
+            f'<div class="standing{" first" if is_first_place else ""}"><div>'
+            f'<span class="emoji">{emoji}</span><span class="rank">{escape(row["Rank"])}</span>'
+            f'<span class="name" style="color: {name_color}; font-weight: {"bold" if is_first_place else "normal"};">'
+            f'{escape(str(row["Salesrep"]))}</span></div><div>'
+            f'<span class="count">{row["Number of New Customers"]}</span><span class="unit">customers</span>'
+            f'<span class="prize">{escape(row["Prize"])}</span></div></div>')
+    return "\n".join(rows)
+
+
+def _customer_line(row, tab_id):
+    customer_num = row["Customer Number"] if pd.notna(row["Customer Number"]) else "N/A"
+    customer_display = f"{row['New Customer']} ({customer_num})"
+    line = f"<strong>{escape(customer_display)}</strong>"
+    if tab_id == 'pending':
+        return f"{line} - <em>Awaiting first invoice</em>"
+    if tab_id == 'violations':
+        reason = row.get("Violation Reason")
+        return f"{line} - <em>{escape(str(reason))}</em>" if pd.notna(reason) else line
+    if pd.notna(row["Last Invoice Date"]):
+        return f"{line} - <em>Invoice: {row['Last Invoice Date'].strftime('%m/%d/%Y')}</em>"
+    return line
+
+
+def _tab_html(df, tab_id, heading, empty_message):
+    parts = [f"<h3>{escape(heading)}</h3>"]
+    if len(df) == 0:
+        parts.append(f'<div class="info">{escape(empty_message)}</div>')
+    for salesrep, group_df in (df.groupby("Salesrep") if len(df) else []):
+        items = "".join(f"<li>{_customer_line(row, tab_id)}</li>" for _, row in group_df.iterrows())
+        parts.append(f"<details><summary><strong>{escape(str(salesrep))}</strong> "
+                     f"({len(group_df)} customers)</summary><ul>{items}</ul></details>")
+    return "\n".join(parts)
+
+
+def _synced_html(synced_at):
+    if not synced_at:
+        return ""
+    sync_time = datetime.strptime(synced_at, '%Y-%m-%d %H:%M:%S')
+    return f'<div class="synced">App last synced: {sync_time.strftime("%B %d, %Y at %I:%M %p")}</div>'
+
+
+_SYNCED_LINE = re.compile(r'<div class="synced">[^<]*</div>')
+
+
+def render_html(results, contest=None, synced_at=None, logo_path=None):
+    """The full page for vpsales.run() results as one HTML string"""
+    radios, labels, panels = [], [], []
+    for index, (tab_id, label, heading, empty_message) in enumerate(TABS):
+        radios.append(f'<input type="radio" name="tabs" id="tab-{tab_id}"{" checked" if index == 0 else ""}>')
+        labels.append(f'<label for="tab-{tab_id}">{escape(label)}</label>')
+        panels.append(f'<section class="panel" id="panel-{tab_id}">'
+                      f'{_tab_html(results[tab_id], tab_id, heading, empty_message)}</section>')
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Van Paper Sales Leaderboard</title>
+<style>{PAGE_CSS}</style>
+</head>
+<body>
+<main>
+{_logo_html(logo_path)}
+{_overview_html(contest)}
+<h3>🏆 Current Standings</h3>
+{_standings_html(results['standings'])}
+<hr>
+<div class="tabs">
+{"".join(radios)}
+{"".join(labels)}
+{"".join(panels)}
+</div>
+{_synced_html(synced_at)}
+</main>
+</body>
+</html>
+"""
+
+
+def write_static_html(path=None, out_path=STATIC_HTML_FILE, synced_at=None):
+    """Render the live (or given) data and swap the page into place atomically (called by ingest)"""
+    from data_source import local_data
+    from sync_metadata import SIDECAR_FILE, read_sync_metadata
+
+    if path is None:
+        path, _ = local_data()
+    if synced_at is None:
+        synced_at = read_sync_metadata(SIDECAR_FILE).get("synced_at")
+    contest = current_contest(load_contests())
+    page = render_html(run(path, contest), contest, synced_at)
+    return _write_page(page, out_path)
+
+
+def write_sync_time(synced_at, out_path=STATIC_HTML_FILE):
+    """Replace only the sync line of an existing page - no data is read or re-ranked.
+    Returns False when there is no page (or no sync line) to update."""
+    out_path = Path(out_path)
+    if not out_path.exists():
+        return False
+    page = out_path.read_text(encoding="utf-8")
+    updated, replaced = _SYNCED_LINE.subn(_synced_html(synced_at), page, count=1)
+    if not replaced:
+        return False
+    if updated != page:
+        _write_page(updated, out_path)
+    return True
+
+
+def _write_page(page, out_path):
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = out_path.with_name(f".{out_path.name}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(page)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, out_path)
+    return out_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the leaderboard as one static HTML file")
+    parser.add_argument("export", nargs="?", help="xlsx export or canonical CSV (default: the live data)")
+    parser.add_argument("--out", default=str(STATIC_HTML_FILE))
+    args = parser.parse_args()
+    written = write_static_html(args.export, args.out)
+    print(f"✅ Wrote {written} ({written.stat().st_size // 1024} KB)")
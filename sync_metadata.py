@@ -0,0 +1,90 @@
+"""
+Sync Metadata Sidecar
+sync_metadata.json records when ingest last checked for reports and what it published
+(source email time, attachment hash, row counts). Ingest rewrites it atomically;
+the app reads it through an mtime-checked cache instead of having a timestamp
+regex-replaced into leaderboard.py, so a "no new data" run never touches app code.
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from publish import read_json, write_json_atomic
+
+APP_DIR = Path(__file__).parent
+SIDECAR_FILE = APP_DIR / "sync_metadata.json"
+# The static page next to the sidecar shows the same sync time
+STATIC_PAGE_NAME = "leaderboard.html"
+
+_cache_lock = threading.Lock()
+_cache = {}
+
+
+def _row_counts(df):
+    """Total rows plus rows with / without a Last Invoice Date"""
+    counts = {'total': int(len(df))}
+    invoice_column = "Last Invoice Date" if "Last Invoice Date" in df.columns else None
+    if invoice_column is None and len(df.columns) >= 4:
+        invoice_column = df.columns[3]
+    if invoice_column is not None:
+        invoiced = int(df[invoice_column].notna().sum())
+        counts['invoiced'] = invoiced
+        counts['pending'] = counts['total'] - invoiced
+    return counts
+
+
+def record_sync(received_time=None, snapshot=None, sha256=None, df=None, path=SIDECAR_FILE):
+    """Update the sidecar after an ingest run.
+
+    With no arguments only synced_at moves forward (a "no new data" check);
+    pass the published report's details when new data went live, with the DataFrame
+    that was loaded so the row counts match it.
+    """
+    metadata = read_json(path)
+    metadata['synced_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    if received_time is not None:
+        metadata['source_received_time'] = received_time.strftime('%Y-%m-%d %H:%M:%S')
+        metadata['published_at'] = metadata['synced_at']
+    if snapshot is not None:
+        metadata['snapshot'] = str(snapshot)
+    if sha256 is not None:
+        metadata['sha256'] = sha256
+    if df is not None:
+        metadata['rows'] = _row_counts(df)
+    elif snapshot is not None or sha256 is not None:
+        # The previous report's counts would be paired with this report's hash
+        metadata.pop('rows', None)
+
+    write_json_atomic(path, metadata)
+    _update_static_page(Path(path).with_name(STATIC_PAGE_NAME), metadata['synced_at'])
+    return metadata
+
+
+def _update_static_page(page_path, synced_at):
+    """Keep the static page's sync line in step with the sidecar (never fails the sync)"""
+    if not page_path.exists():
+        return
+    try:
+        from static_export import write_sync_time
+        write_sync_time(synced_at, page_path)
+    except Exception as e:
+        print(f"⚠️ {page_path.name} sync time not updated: {e}")
+
+
+def read_sync_metadata(path=SIDECAR_FILE):
+    """Return the sidecar contents, re-reading the file only when its mtime changes"""
+    path = Path(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        metadata = read_json(path)
+        _cache[path] = (mtime, metadata)
+        return metadata
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Standings Timeline
+Daily new-customer count and rank per rep across the contest periods, kept in
+history/timeline.parquet for the app's standings-over-time chart.
+Each published report only re-counts the reps its changed rows belong to -
+duplicates are matched within a rep, so no other rep's count can move.
+
+Usage:
+    python timeline.py             # show the latest day
+    python timeline.py rebuild     # recompute from the snapshot store
+"""
+
+import argparse
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from contests import contest_rules, current_contest, in_window, load_contests
+from leaderboard_model import classify, prepare
+from publish import read_json, write_json_atomic
+from report_diff import diff_exports
+from snapshot_store import load_rows, read_snapshot_index
+
+APP_DIR = Path(__file__).parent
+TIMELINE_FILE = APP_DIR / "history" / "timeline.parquet"
+STATE_FILE = APP_DIR / "history" / "timeline_state.json"
+
+TIMELINE_COLUMNS = ["Date", "Salesrep", "New Customers", "Rank"]
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def rep_counts(df, reps=None):
+    """{salesrep: counted new customers} for all reps, or only the given ones -
+    invoices inside the current contest window only, as in the app's standings"""
+    contest = current_contest(load_contests())
+    rules = contest_rules(contest)
+    prepared = prepare(df, rules)
+    if reps is not None:
+        prepared = prepared[prepared["Salesrep"].isin(reps)]
+    if len(prepared) == 0:
+        return {}
+    counted, _, _ = classify(prepared, rules)
+    if contest:
+        counted = in_window(counted, contest)
+    if len(counted) == 0:
+        return {}
+    return {rep: int(n) for rep, n in counted.groupby("Salesrep")["New Customer"].nunique().items()}
+
+
+def apply_report(counts, df, changes=None):
+    """Running counts after a report: a full count without a diff, else only the changed reps"""
+    if changes is None:
+        return rep_counts(df)
+    touched = {change['salesrep'] for change in changes}
+    if not touched:
+        return dict(counts)
+    updated = {rep: n for rep, n in counts.items() if rep not in touched}
+    updated.update(rep_counts(df, touched))
+    return updated
+
+
+def _day_rows(day, counts):
+    ranked = pd.Series(counts, dtype="int64").rank(method='min', ascending=False).astype(int)
+    return [{"Date": pd.Timestamp(day), "Salesrep": rep, "New Customers": n, "Rank": int(ranked[rep])}
+            for rep, n in counts.items()]
+
+
+def read_timeline(path=TIMELINE_FILE):
+    """The daily series as a DataFrame (empty if nothing has been recorded)"""
+    try:
+        return pd.read_parquet(path)
+    except (FileNotFoundError, OSError):
+        return pd.DataFrame(columns=TIMELINE_COLUMNS)
+
+
+def _extend(timeline, last_day, counts_before, day, counts):
+    """Carry the previous counts forward over days without a report, then set `day`"""
+    rows = []
+    if last_day is not None:
+        gap = last_day + timedelta(days=1)
+        while gap < day:
+            rows.extend(_day_rows(gap, counts_before))
+            gap += timedelta(days=1)
+    rows.extend(_day_rows(day, counts))
+    timeline = timeline[timeline["Date"] != pd.Timestamp(day)] if len(timeline) else timeline
+    new_rows = pd.DataFrame(rows, columns=TIMELINE_COLUMNS)
+    if len(timeline) == 0:
+        return new_rows
+    return pd.concat([timeline, new_rows], ignore_index=True)
+
+
+def _in_period(day):
+    """Inside any contest window from contests.json"""
+    return any(contest['start'] <= day <= contest['end'] for contest in load_contests())
+
+
+def _save(timeline, state):
+    TIMELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = TIMELINE_FILE.with_name(f".{TIMELINE_FILE.name}.tmp")
+    timeline.sort_values(["Date", "Rank", "Salesrep"]).to_parquet(temp_path, index=False)
+    temp_path.replace(TIMELINE_FILE)
+    write_json_atomic(STATE_FILE, state)
+
+
+def update_timeline(df, received_time, changes=None, previous_sha256=None, sha256=None):
+    """Extend the timeline with a newly published report.
+
+    changes is the report's diff against the previous live data; it is only trusted
+    when previous_sha256 matches the report the running counts were built from.
+    A report older than the last one applied triggers a rebuild instead.
+    """
+    state = read_json(STATE_FILE)
+    received_time = datetime(received_time.year, received_time.month, received_time.day,
+                             received_time.hour, received_time.minute, received_time.second)
+    if state.get('received_time') and received_time.strftime(TIME_FORMAT) < state['received_time']:
+        return rebuild_timeline()
+
+    if state.get('sha256') is None or state.get('sha256') != previous_sha256:
+        changes = None
+    counts_before = state.get('counts', {})
+    counts = apply_report(counts_before, df, changes)
+
+    timeline = read_timeline()
+    day = received_time.date()
+    if _in_period(day):
+        last_day = date.fromisoformat(state['day']) if state.get('day') else None
+        timeline = _extend(timeline, last_day, counts_before, day, counts)
+
+    state = {
+        'received_time': received_time.strftime(TIME_FORMAT),
+        'day': day.isoformat() if _in_period(day) else state.get('day'),
+        'sha256': sha256,
+        'counts': counts,
+    }
+    _save(timeline, state)
+    return timeline
+
+
+def rebuild_timeline():
+    """Walk the snapshot store in time order, applying each report's diff to the running counts"""
+    _, entries = read_snapshot_index()
+    timeline = pd.DataFrame(columns=TIMELINE_COLUMNS)
+    counts, previous, last_day = {}, None, None
+    for entry in entries:
+        rows = load_rows(entry)
+        changes = diff_exports(previous, rows) if previous is not None else None
+        counts_before = counts
+        counts = apply_report(counts, rows, changes)
+        previous = rows
+
+        day = datetime.strptime(entry['received_time'], TIME_FORMAT).date()
+        if _in_period(day):
+            timeline = _extend(timeline, last_day, counts_before, day, counts)
+            last_day = day
+
+    state = {
+        'received_time': entries[-1]['received_time'] if entries else None,
+        'day': last_day.isoformat() if last_day else None,
+        'sha256': entries[-1]['sha256'] if entries else None,
+        'counts': counts,
+    }
+    _save(timeline, state)
+    return timeline
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Daily standings timeline")
+    parser.add_argument("command", nargs="?", choices=["show", "rebuild"], default="show")
+    args = parser.parse_args()
+
+    timeline = rebuild_timeline() if args.command == "rebuild" else read_timeline()
+    if len(timeline) == 0:
+        print("📈 No timeline yet - publish a report or run: python timeline.py rebuild")
+    else:
+        last = timeline[timeline["Date"] == timeline["Date"].max()]
+        print(f"📈 {timeline['Date'].nunique()} days; standings on {last['Date'].iloc[0]:%B %d, %Y}:")
+        print(last[["Rank", "Salesrep", "New Customers"]].to_string(index=False))
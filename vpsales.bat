@@ -0,0 +1,3 @@
+@echo off
+REM Leaderboard standings from the command line - see: vpsales --help
+python "%~dp0vpsales.py" %*
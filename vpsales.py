@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Van Paper Leaderboard CLI
+Computes the standings from an export without Streamlit, so ingest jobs, tests and
+benchmarks can run the same contest rules as the app. Only pandas and the rule
+modules are imported (no streamlit, PIL or st_aggrid), which keeps start-up short.
+The live data is the canonical CSV; reading an xlsx instead loads openpyxl.
+
+Usage:
+    python vpsales.py                                   # live data, JSON to stdout
+    python vpsales.py leaderboardexport.xlsx --format csv --out results
+    python vpsales.py --contest fall-2025 --format parquet --out results
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from canonical_export import read_export
+from contests import current_contest, in_window, load_contests
+from leaderboard_model import build_standings, classify, compile_rules, prepare
+
+# Columns written for each customer list
+CUSTOMER_COLUMNS = ["Salesrep", "New Customer", "Customer Number", "Last Invoice Date"]
+VIOLATION_COLUMNS = CUSTOMER_COLUMNS + ["Violation Reason"]
+
+
+class StageTimer:
+    """Collects wall-clock milliseconds per named stage"""
+
+    def __init__(self):
+        self.timings = {}
+
+    def stage(self, name, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        self.timings[name] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+
+def _customers(df, columns):
+    """The customer list columns of a classified frame (empty frames keep the header)"""
+    present = [column for column in columns if column in df.columns]
+    return df[present].reset_index(drop=True) if len(df) else df.reindex(columns=columns)
+
+
+def run(path, contest=None, timer=None):
+    """Load, dedupe, rank and prize one export; returns a dict of DataFrames"""
+    timer = timer or StageTimer()
+    rules = contest['rules'] if contest else compile_rules()
+
+    raw = timer.stage('load', read_export, path)
+    prepared = timer.stage('prepare', prepare, raw, rules)
+    counted, pending, violations = timer.stage('dedupe', classify, prepared, rules)
+    if contest and len(counted):
+        counted = timer.stage('window', in_window, counted, contest)
+    standings = timer.stage('rank', build_standings, counted, rules)
+
+    return {
+        'standings': standings,
+        'counted': _customers(counted, CUSTOMER_COLUMNS),
+        'pending': _customers(pending, CUSTOMER_COLUMNS),
+        'violations': _customers(violations, VIOLATION_COLUMNS),
+    }
+
+
+def _json_records(df):
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def write_results(results, output_format, out_dir=None, meta=None):
+    """JSON to stdout (or out_dir/leaderboard.json); CSV/Parquet as one file per table"""
+    if output_format == "json":
+        document = {**(meta or {}), **{name: _json_records(df) for name, df in results.items()}}
+        text = json.dumps(document, indent=2)
+        if out_dir is None:
+            print(text)
+            return []
+        out_path = Path(out_dir) / "leaderboard.json"
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text, encoding="utf-8")
+        return [out_path]
+
+    out_dir = Path(out_dir or "vpsales_output")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, df in results.items():
+        out_path = out_dir / f"{name}.{output_format}"
+        if output_format == "csv":
+            df.to_csv(out_path, index=False)
+        else:
+            df.astype({column: str for column in df.columns if str(df[column].dtype) == "category"}
+                      ).to_parquet(out_path, index=False)
+        written.append(out_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="vpsales", description="Compute leaderboard standings from an export")
+    parser.add_argument("export", nargs="?", help="xlsx export or canonical CSV (default: the live data)")
+    parser.add_argument("--format", choices=["json", "csv", "parquet"], default="json")
+    parser.add_argument("--out", help="output folder (JSON goes to stdout when omitted)")
+    parser.add_argument("--contest", help="contest id from contests.json (default: the current one)")
+    parser.add_argument("--quiet", action="store_true", help="don't print stage timings")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.export:
+        path = Path(args.export)
+    else:
+        from data_source import local_data
+        path, _ = local_data()
+
+    contests = load_contests()
+    if args.contest:
+        matching = [contest for contest in contests if contest['id'] == args.contest]
+        if not matching:
+            parser.error(f"unknown contest '{args.contest}' - known: {', '.join(c['id'] for c in contests)}")
+        contest = matching[0]
+    else:
+        contest = current_contest(contests)
+
+    timer = StageTimer()
+    results = run(path, contest, timer)
+    meta = {
+        'source': str(path),
+        'contest': contest['id'] if contest else None,
+        'timings_ms': timer.timings,
+    }
+    written = timer.stage('write', write_results, results, args.format, args.out, meta)
+    timer.timings['total'] = round((time.perf_counter() - started) * 1000, 2)
+
+    if not args.quiet:
+        for path_written in written:
+            print(f"✅ {path_written}", file=sys.stderr)
+        stages = "  ".join(f"{name} {ms:.1f}ms" for name, ms in timer.timings.items())
+        print(f"⏱️ {stages}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())